@@ -2,8 +2,10 @@ local config = require("metermeter.config")
 
 local M = {}
 
+-- The counters used below are numeric from state.new_state() on (and only ever reset
+-- to 0), so the per-lookup paths skip the defensive tonumber() coercions.
 function M.touch(st, entry)
-  st.cache_seq = (tonumber(st.cache_seq) or 0) + 1
+  st.cache_seq = st.cache_seq + 1
   entry.at = st.cache_seq
 end
 
@@ -21,33 +23,33 @@ function M.put(st, key, payload)
   if not entry then
     entry = { payload = payload, at = 0 }
     st.cache[key] = entry
-    st.cache_size = (tonumber(st.cache_size) or 0) + 1
+    st.cache_size = st.cache_size + 1
   else
     entry.payload = payload
   end
   M.touch(st, entry)
-  st.cache_write_seq = (tonumber(st.cache_write_seq) or 0) + 1
+  st.cache_write_seq = st.cache_write_seq + 1
 
   local max_entries = config.cache_max_entries()
-  while (tonumber(st.cache_size) or 0) > max_entries do
-    local oldest_key = nil
-    local oldest_at = nil
+  if st.cache_size > max_entries then
+    -- Evict least-recently-used entries in one batch down to ~90% of capacity, so the
+    -- full-cache pass runs once per tenth of capacity in puts rather than on every put.
+    local by_age = {}
     for k, v in pairs(st.cache) do
-      local at = tonumber(v and v.at) or 0
-      if oldest_at == nil or at < oldest_at then
-        oldest_at = at
-        oldest_key = k
-      end
+      by_age[#by_age + 1] = { key = k, at = v.at }
     end
-    if oldest_key == nil then
-      break
+    table.sort(by_age, function(a, b)
+      return a.at < b.at
+    end)
+    local target = max_entries - math.floor(max_entries / 10)
+    for i = 1, #by_age - target do
+      st.cache[by_age[i].key] = nil
     end
-    st.cache[oldest_key] = nil
-    st.cache_size = math.max(0, (tonumber(st.cache_size) or 1) - 1)
+    st.cache_size = math.min(#by_age, target)
   end
 end
 
-function M.key_for_text(st, text)
+local function _key_prefix(st)
   local epoch = 0
   if st and st.cache_epoch then
     epoch = tonumber(st.cache_epoch) or 0
@@ -65,7 +67,26 @@ function M.key_for_text(st, text)
     ctx = ctx_meter .. "@" .. string.format("%.2f", ctx_strength)
   end
 
-  return tostring(epoch) .. "\n" .. ctx .. "\n" .. text
+  return tostring(epoch) .. "\n" .. ctx .. "\n"
+end
+
+function M.key_for_text(st, text)
+  if not st then
+    return _key_prefix(st) .. text
+  end
+  -- Called for every scanned line; the prefix only changes with the epoch or the
+  -- analysis context, so rebuild it only when one of those moved.
+  local epoch, meter, strength = st.cache_epoch, st.analysis_context_meter, st.analysis_context_strength
+  if
+    st.cache_key_prefix == nil
+    or st.cache_key_epoch ~= epoch
+    or st.cache_key_meter ~= meter
+    or st.cache_key_strength ~= strength
+  then
+    st.cache_key_prefix = _key_prefix(st)
+    st.cache_key_epoch, st.cache_key_meter, st.cache_key_strength = epoch, meter, strength
+  end
+  return st.cache_key_prefix .. text
 end
 
 return M
@@ -31,6 +31,11 @@ local DEFAULTS = {
 }
 
 M.cfg = vim.deepcopy(DEFAULTS)
+-- Bumped whenever M.cfg is replaced, so values derived from it can be cached per version.
+M.version = 0
+
+-- Valid ui.meter_hint_details values, as a set for O(1) membership checks.
+M.METER_HINT_DETAIL_MODES = { off = true, deviations = true, always = true }
 
 local function _to_bool(v)
   if v == nil then
@@ -72,70 +77,62 @@ local function _to_string(v)
   return tostring(v)
 end
 
+local function _to_detail_mode(v)
+  local s = _to_string(v)
+  if s == nil then
+    return nil
+  end
+  s = s:lower()
+  if M.METER_HINT_DETAIL_MODES[s] then
+    return s
+  end
+  return nil
+end
+
+local function _to_path(v)
+  local s = _to_string(v)
+  if s == "" then
+    return nil
+  end
+  return s
+end
+
+-- g:metermeter_* globals: variable name, config path, and the coercion applied to
+-- the raw value (nil => leave the config value alone).
+local VIM_GLOBALS = {
+  { "metermeter_debounce_ms", { "debounce_ms" }, _to_number },
+  { "metermeter_rescan_interval_ms", { "rescan_interval_ms" }, _to_number },
+  { "metermeter_prefetch_lines", { "prefetch_lines" }, _to_number },
+  { "metermeter_require_trailing_backslash", { "require_trailing_backslash" }, _to_bool },
+  { "metermeter_ui_stress", { "ui", "stress" }, _to_bool },
+  { "metermeter_ui_meter_hints", { "ui", "meter_hints" }, _to_bool },
+  { "metermeter_ui_meter_hint_abbrev", { "ui", "meter_hint_abbrev" }, _to_bool },
+  { "metermeter_ui_meter_hint_details", { "ui", "meter_hint_details" }, _to_detail_mode },
+  { "metermeter_ui_confident_threshold", { "ui", "confident_threshold" }, _to_number },
+  { "metermeter_ui_loading_indicator", { "ui", "loading_indicator" }, _to_bool },
+  { "metermeter_cache_max_entries", { "cache", "max_entries" }, _to_number },
+  { "metermeter_debug_dump_path", { "debug_dump_path" }, _to_path },
+}
+
 local function _apply_vim_globals(cfg)
   -- Global config for init.vim/init.lua (read during setup()).
   -- Vimscript example:
   --   let g:metermeter_debounce_ms = 120
   --   let g:metermeter_ui_meter_hint_abbrev = v:true
   local g = vim.g
-  local n
-
-  n = _to_number(g.metermeter_debounce_ms)
-  if n then
-    cfg.debounce_ms = n
-  end
-  n = _to_number(g.metermeter_rescan_interval_ms)
-  if n then
-    cfg.rescan_interval_ms = n
-  end
-  n = _to_number(g.metermeter_prefetch_lines)
-  if n then
-    cfg.prefetch_lines = n
-  end
-  local b = _to_bool(g.metermeter_require_trailing_backslash)
-  if b ~= nil then
-    cfg.require_trailing_backslash = b
-  end
-
   cfg.ui = cfg.ui or {}
-  b = _to_bool(g.metermeter_ui_stress)
-  if b ~= nil then
-    cfg.ui.stress = b
-  end
-  b = _to_bool(g.metermeter_ui_meter_hints)
-  if b ~= nil then
-    cfg.ui.meter_hints = b
-  end
-  b = _to_bool(g.metermeter_ui_meter_hint_abbrev)
-  if b ~= nil then
-    cfg.ui.meter_hint_abbrev = b
-  end
-  local s = _to_string(g.metermeter_ui_meter_hint_details)
-  if type(s) == "string" then
-    s = s:lower()
-    if s == "off" or s == "always" or s == "deviations" then
-      cfg.ui.meter_hint_details = s
-    end
-  end
-  n = _to_number(g.metermeter_ui_confident_threshold)
-  if n then
-    cfg.ui.confident_threshold = n
-  end
-  b = _to_bool(g.metermeter_ui_loading_indicator)
-  if b ~= nil then
-    cfg.ui.loading_indicator = b
-  end
-
   cfg.cache = cfg.cache or {}
-  n = _to_number(g.metermeter_cache_max_entries)
-  if n then
-    cfg.cache.max_entries = n
-  end
-  s = _to_string(g.metermeter_debug_dump_path)
-  if type(s) == "string" and s ~= "" then
-    cfg.debug_dump_path = s
+  for _, spec in ipairs(VIM_GLOBALS) do
+    local v = spec[3](g[spec[1]])
+    if v ~= nil then
+      local path = spec[2]
+      local parent = cfg
+      for i = 1, #path - 1 do
+        parent = parent[path[i]]
+      end
+      parent[path[#path]] = v
+    end
   end
-
   return cfg
 end
 
@@ -144,21 +141,39 @@ function M.apply(opts)
   local cfg = vim.tbl_deep_extend("force", vim.deepcopy(DEFAULTS), opts or {})
   cfg = _apply_vim_globals(cfg)
   M.cfg = cfg
+  M.version = M.version + 1
 end
 
+-- cache_max_entries() for config version max_entries_version; it is read on every
+-- cache write.
+local max_entries = nil
+local max_entries_version = nil
+
 function M.cache_max_entries()
+  if max_entries_version == M.version then
+    return max_entries
+  end
   local n = tonumber(M.cfg.cache and M.cfg.cache.max_entries) or 5000
   if n < 100 then
     n = 100
   end
-  return math.floor(n)
+  max_entries = math.floor(n)
+  max_entries_version = M.version
+  return max_entries
 end
 
+-- The plugin's location can't change while it is loaded; resolve it once.
+local plugin_root = nil
+
 function M.plugin_root()
+  if plugin_root then
+    return plugin_root
+  end
   local src = debug.getinfo(1, "S").source
   local path = src:sub(2) -- drop leading "@"
   path = vim.fn.resolve(path) -- resolve to absolute path
-  return vim.fn.fnamemodify(path, ":p:h:h:h") -- .../lua/metermeter/config.lua -> plugin root
+  plugin_root = vim.fn.fnamemodify(path, ":p:h:h:h") -- .../lua/metermeter/config.lua -> plugin root
+  return plugin_root
 end
 
 return M
@@ -11,15 +11,75 @@ local M = {}
 
 local last_notify_time = 0
 
-local function refresh_statusline()
-  -- lualine has its own component cache that redrawstatus! alone doesn't always invalidate.
+-- Rows closer together than this are read with one nvim_buf_get_lines call; farther
+-- apart (e.g. two windows on distant parts of a file) they are read separately.
+local READ_GAP_LINES = 64
+
+-- Per-request deadline scales with batch size; subprocess.lua starts it once the
+-- request reaches the front of the worker's queue. A freshly spawned worker's start-up
+-- (prosodic import and warm-up) is covered by subprocess.lua's own grace period.
+local REQUEST_TIMEOUT_BASE_MS = 15000
+local REQUEST_TIMEOUT_PER_LINE_MS = 250
+
+-- Everything M.statusline() shows for a buffer.
+local function statusline_sig(st)
+  return tostring(st.enabled) .. "\0" .. tostring(st.dominant_meter or "") .. "\0" .. tostring(st.last_error or "")
+end
+
+local statusline_redraw_scheduled = false
+
+-- A failed require searches the whole runtimepath, so without lualine installed each
+-- redraw would pay for it. Remember misses and only retry (lualine may be lazy-loaded
+-- later) once this many ms have passed on the monotonic loop clock.
+local LUALINE_RETRY_MS = 5000
+local lualine_mod = nil
+local lualine_checked_at = nil
+
+local function get_lualine()
+  if lualine_mod then
+    return lualine_mod
+  end
+  local now = uv.now()
+  if lualine_checked_at and now - lualine_checked_at < LUALINE_RETRY_MS then
+    return nil
+  end
+  lualine_checked_at = now
   local ok, lualine = pcall(require, "lualine")
   if ok and type(lualine) == "table" and type(lualine.refresh) == "function" then
+    lualine_mod = lualine
+  end
+  return lualine_mod
+end
+
+local function redraw_statusline()
+  statusline_redraw_scheduled = false
+  -- lualine has its own component cache that redrawstatus! alone doesn't always invalidate.
+  local lualine = get_lualine()
+  if lualine then
     pcall(lualine.refresh)
   end
   vim.cmd("redrawstatus!")
 end
 
+--- Call after changing anything M.statusline() shows for st (enabled, dominant meter,
+--- last error). A full statusline redraw (and lualine refresh) only happens when that
+--- text actually changed, and is coalesced with other requests in the same tick.
+---@param st table buffer state; records what the statusline now reflects
+local function refresh_statusline(st)
+  local sig = statusline_sig(st)
+  if sig == st.last_status_sig then
+    return
+  end
+  st.last_status_sig = sig
+  -- Several buffers or scan phases can ask in the same tick (e.g. setup enabling every
+  -- open buffer); coalesce them into a single redraw.
+  if statusline_redraw_scheduled then
+    return
+  end
+  statusline_redraw_scheduled = true
+  vim.schedule(redraw_statusline)
+end
+
 M.refresh_statusline = refresh_statusline
 
 function M.default_subprocess_cmd()
@@ -48,12 +108,44 @@ local function build_request(bufnr, ordered_lines, state_by_buf)
 
   local lines = {}
   local st = state_by_buf[bufnr]
+  local is_scan_line = filter.scan_line_predicate(bufnr)
+
+  -- Read each run of nearby rows in one call rather than one call per line. Phase line
+  -- lists arrive ascending; out-of-order rows just start a new run.
+  local text_by_lnum = {}
+  local lo, hi
+  local function read_run()
+    if lo then
+      for i, text in ipairs(vim.api.nvim_buf_get_lines(bufnr, lo, hi + 1, false)) do
+        text_by_lnum[lo + i - 1] = text
+      end
+    end
+  end
+  for _, lnum in ipairs(ordered_lines or {}) do
+    if lnum >= 0 and lnum < line_count then
+      if lo and lnum > hi and lnum - hi <= READ_GAP_LINES then
+        hi = lnum
+      elseif not lo or lnum < lo or lnum > hi then
+        read_run()
+        lo, hi = lnum, lnum
+      end
+    end
+  end
+  read_run()
 
+  -- Refrains and repeated lines only need analysing once; the returned key set lets
+  -- the pending bookkeeping retire the other copies even when no result gets cached
+  -- for their text (e.g. letterless dividers, or a failed request).
+  local requested = {}
   for _, lnum in ipairs(ordered_lines or {}) do
     if lnum >= 0 and lnum < line_count then
-      local text = (vim.api.nvim_buf_get_lines(bufnr, lnum, lnum + 1, false)[1] or "")
-      if filter.is_scan_line(bufnr, text) and not cache.get(st, cache.key_for_text(st, text)) then
-        table.insert(lines, { lnum = lnum, text = text })
+      local text = text_by_lnum[lnum] or ""
+      if is_scan_line(bufnr, text) then
+        local key = cache.key_for_text(st, text)
+        if not requested[key] and not cache.get(st, key) then
+          requested[key] = true
+          table.insert(lines, { lnum = lnum, text = text })
+        end
       end
     end
   end
@@ -68,10 +160,13 @@ local function build_request(bufnr, ordered_lines, state_by_buf)
       dominant_strength = ctx_strength,
     }
   end
-  return req
+  return req, requested
 end
 
-local function merge_cache_and_results(bufnr, resp, ordered_lines, state_by_buf)
+---@param buf_lines? string[] snapshot of the whole buffer; read (only if needed) when absent
+---@return table[] results
+---@return boolean unchanged true when results are the previous merge's, reused as-is
+local function merge_cache_and_results(bufnr, resp, ordered_lines, state_by_buf, buf_lines)
   local st = state_by_buf[bufnr]
   if type(resp) ~= "table" or type(resp.results) ~= "table" then
     return {}
@@ -88,6 +183,19 @@ local function merge_cache_and_results(bufnr, resp, ordered_lines, state_by_buf)
       })
     end
   end
+  -- Same scan and line set, same buffer text, nothing cached since the last merge:
+  -- the gathered results (and dominant meter) would come out identical.
+  local merge_sig = table.concat({
+    st.scan_generation,
+    vim.api.nvim_buf_get_changedtick(bufnr),
+    st.cache_epoch,
+    st.cache_write_seq,
+  }, ":")
+  if merge_sig == st.last_merge_sig and ordered_lines == st.last_merge_lines and st.last_merge_results then
+    return st.last_merge_results, true
+  end
+  -- The line set spans every scan line, so one whole-buffer read beats one per line.
+  buf_lines = buf_lines or vim.api.nvim_buf_get_lines(bufnr, 0, -1, false)
   -- Return results for current visible lines from cache.
   local out = {}
   local cfg = config.cfg
@@ -96,11 +204,15 @@ local function merge_cache_and_results(bufnr, resp, ordered_lines, state_by_buf)
     local visible_lines, prefetch_lines = scanner.candidate_line_set_for_buf(bufnr, cfg.prefetch_lines)
     line_set = scanner.combine_lines(visible_lines, prefetch_lines)
   end
-  local line_count = vim.api.nvim_buf_line_count(bufnr)
+  local line_count = #buf_lines
+  local is_scan_line = filter.scan_line_predicate(bufnr)
+  -- Scan-line lists arrive ascending, so the sort below is usually unnecessary.
+  local ordered = true
+  local prev_lnum = -1
   for _, lnum in ipairs(line_set) do
     if lnum >= 0 and lnum < line_count then
-      local text = (vim.api.nvim_buf_get_lines(bufnr, lnum, lnum + 1, false)[1] or "")
-      if filter.is_scan_line(bufnr, text) then
+      local text = buf_lines[lnum + 1]
+      if is_scan_line(bufnr, text) then
         local key = cache.key_for_text(st, text)
         local cached = cache.get(st, key)
         if cached then
@@ -112,13 +224,19 @@ local function merge_cache_and_results(bufnr, resp, ordered_lines, state_by_buf)
             stress_spans = cached.stress_spans or {},
             meter_features = cached.meter_features,
           })
+          if lnum < prev_lnum then
+            ordered = false
+          end
+          prev_lnum = lnum
         end
       end
     end
   end
-  table.sort(out, function(a, b)
-    return (a.lnum or 0) < (b.lnum or 0)
-  end)
+  if not ordered then
+    table.sort(out, function(a, b)
+      return (a.lnum or 0) < (b.lnum or 0)
+    end)
+  end
 
   -- Compute dominant meter from cached results.
   local counts = {}
@@ -150,7 +268,10 @@ local function merge_cache_and_results(bufnr, resp, ordered_lines, state_by_buf)
     st.dominant_strength = best_weight / total
   end
 
-  return out
+  st.last_merge_sig = merge_sig
+  st.last_merge_lines = ordered_lines
+  st.last_merge_results = out
+  return out, false
 end
 
 local function maybe_apply_results(bufnr, results, state_by_buf)
@@ -169,7 +290,7 @@ local function maybe_apply_results(bufnr, results, state_by_buf)
   st.last_render_sig = sig
   st.debug_apply_count = (tonumber(st.debug_apply_count) or 0) + 1
   render.apply_results(bufnr, results)
-  refresh_statusline()
+  refresh_statusline(st)
 end
 
 local function run_phase(bufnr, scan_generation, render_lines, lines, on_done, state_by_buf, subprocess_cmd)
@@ -181,7 +302,7 @@ local function run_phase(bufnr, scan_generation, render_lines, lines, on_done, s
     return
   end
 
-  local req = build_request(bufnr, lines, state_by_buf)
+  local req, requested = build_request(bufnr, lines, state_by_buf)
   if #req.lines == 0 then
     if on_done then
       on_done()
@@ -199,12 +320,14 @@ local function run_phase(bufnr, scan_generation, render_lines, lines, on_done, s
       last_notify_time = now
       vim.notify("MeterMeter: " .. st.last_error, vim.log.levels.WARN)
     end
+    refresh_statusline(st)
     if on_done then
       on_done()
     end
     return
   end
 
+  local timeout_ms = REQUEST_TIMEOUT_BASE_MS + REQUEST_TIMEOUT_PER_LINE_MS * #req.lines
   subprocess.send(req, function(resp, err)
     local st2 = state_by_buf[bufnr]
     if not st2 then
@@ -223,9 +346,12 @@ local function run_phase(bufnr, scan_generation, render_lines, lines, on_done, s
       st2.last_error = err
     elseif resp then
       st2.last_error = nil
-      local results = merge_cache_and_results(bufnr, resp, render_lines, state_by_buf)
-      maybe_apply_results(bufnr, results, state_by_buf)
+      local results, unchanged = merge_cache_and_results(bufnr, resp, render_lines, state_by_buf)
+      if not unchanged then
+        maybe_apply_results(bufnr, results, state_by_buf)
+      end
     end
+    refresh_statusline(st2)
 
     -- Remove lines just processed from pending
     local processed = {}
@@ -241,8 +367,9 @@ local function run_phase(bufnr, scan_generation, render_lines, lines, on_done, s
         end
       else
         local key = st2.pending_keys and st2.pending_keys[lnum]
-        if key and st2.cache and st2.cache[key] ~= nil then
-          -- This line is now cached (e.g. duplicate text elsewhere), so it no longer needs analysis.
+        if key and (requested[key] or (st2.cache and st2.cache[key] ~= nil)) then
+          -- Its text was in this request or is now cached (e.g. duplicate text elsewhere),
+          -- so it no longer needs analysis.
           if st2.pending_keys then
             st2.pending_keys[lnum] = nil
           end
@@ -265,7 +392,7 @@ local function run_phase(bufnr, scan_generation, render_lines, lines, on_done, s
     if on_done then
       on_done()
     end
-  end)
+  end, timeout_ms)
 end
 
 function M.do_scan(bufnr, state_by_buf, subprocess_cmd)
@@ -283,7 +410,8 @@ function M.do_scan(bufnr, state_by_buf, subprocess_cmd)
     st.analysis_context_changedtick = changedtick
     st.analysis_context_pass = 0
   end
-  local view_sig = scanner.viewport_signature(bufnr)
+  local views = scanner.window_views(bufnr)
+  local view_sig = scanner.viewport_signature(bufnr, views)
   if (not st.scan_running) and st.last_changedtick == changedtick and st.last_view_sig == view_sig then
     return
   end
@@ -299,14 +427,30 @@ function M.do_scan(bufnr, state_by_buf, subprocess_cmd)
   st.scan_generation = (tonumber(st.scan_generation) or 0) + 1
   local gen = st.scan_generation
 
-  local visible_lines, prefetch_lines = scanner.candidate_line_set_for_buf(bufnr, cfg.prefetch_lines)
-  local prioritized_lines = scanner.combine_lines(visible_lines, prefetch_lines)
-  local all_scan_lines = scanner.all_scan_lines_for_buf(bufnr, filter.is_scan_line)
-  local background_lines = scanner.subtract_lines(all_scan_lines, prioritized_lines)
+  local visible_lines, prefetch_lines = scanner.candidate_line_set_for_buf(bufnr, cfg.prefetch_lines, views)
+  -- Snapshot the buffer once; the scan-line filter, cached render and pending
+  -- computation below all read from it.
+  local buf_lines = vim.api.nvim_buf_get_lines(bufnr, 0, -1, false)
+  local line_count = #buf_lines
+  -- Scrolling rescans an unchanged buffer; reuse its scan-line list unless the text or
+  -- the filter settings changed.
+  local is_scan_line, filter_key = filter.scan_line_predicate(bufnr)
+  local all_scan_lines
+  if st.scan_lines_changedtick == changedtick and st.scan_lines_filter_key == filter_key then
+    all_scan_lines = st.scan_lines
+  else
+    all_scan_lines = scanner.all_scan_lines_for_buf(bufnr, is_scan_line, buf_lines)
+    st.scan_lines = all_scan_lines
+    st.scan_lines_changedtick = changedtick
+    st.scan_lines_filter_key = filter_key
+  end
+  -- Only membership in the visible/prefetch lines matters here, so subtract both
+  -- directly instead of first building their ordered union.
+  local background_lines = scanner.subtract_lines(all_scan_lines, visible_lines, prefetch_lines)
   local render_lines = all_scan_lines
 
   -- Render cached results immediately to avoid blank states during async work.
-  local cached_results = merge_cache_and_results(bufnr, { results = {} }, render_lines, state_by_buf)
+  local cached_results = merge_cache_and_results(bufnr, { results = {} }, render_lines, state_by_buf, buf_lines)
   maybe_apply_results(bufnr, cached_results, state_by_buf)
   if #all_scan_lines == 0 then
     st.dominant_meter = ""
@@ -316,16 +460,16 @@ function M.do_scan(bufnr, state_by_buf, subprocess_cmd)
     st.analysis_context_meter = ""
     st.analysis_context_strength = 0
     st.scan_running = false
+    refresh_statusline(st)
     return
   end
 
   -- Compute uncached lines that still need analysis
   local pending = {}
   local pending_keys = {}
-  local line_count = vim.api.nvim_buf_line_count(bufnr)
   for _, lnum in ipairs(all_scan_lines) do
     if lnum >= 0 and lnum < line_count then
-      local text = (vim.api.nvim_buf_get_lines(bufnr, lnum, lnum + 1, false)[1] or "")
+      local text = buf_lines[lnum + 1]
       local key = cache.key_for_text(st, text)
       if not cache.get(st, key) then
         pending[#pending + 1] = lnum
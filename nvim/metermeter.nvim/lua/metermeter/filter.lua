@@ -2,8 +2,13 @@ local config = require("metermeter.config")
 
 local M = {}
 
+-- Dot-separated filetype parts as a set, keyed by the raw 'filetype' value; buffer
+-- enter/filetype autocmds ask about the same few values over and over.
+local ft_parts_by_ft = {}
+
 function M.has_ft_token(bufnr, token)
-  local ft = (vim.bo[bufnr] and vim.bo[bufnr].filetype) or ""
+  local bo = vim.bo[bufnr]
+  local ft = (bo and bo.filetype) or ""
   if type(ft) ~= "string" or ft == "" then
     return false
   end
@@ -14,12 +19,15 @@ function M.has_ft_token(bufnr, token)
   if ft == token then
     return true
   end
-  for part in string.gmatch(ft, "[^%.]+") do
-    if part == token then
-      return true
+  local parts = ft_parts_by_ft[ft]
+  if not parts then
+    parts = {}
+    for part in string.gmatch(ft, "[^%.]+") do
+      parts[part] = true
     end
+    ft_parts_by_ft[ft] = parts
   end
-  return false
+  return parts[token] == true
 end
 
 function M.should_enable(bufnr)
@@ -46,11 +54,14 @@ local function _split_csv(s)
   return out
 end
 
-local function _comment_leaders(bufnr)
+-- Parsed leader lists keyed by the raw option values; filetypes share a handful of
+-- distinct 'comments'/'commentstring' settings, so this stays tiny.
+local leaders_by_options = {}
+
+local function _parse_comment_leaders(comments, cs)
   local leaders = {}
   local seen = {}
 
-  local comments = (vim.bo[bufnr] and vim.bo[bufnr].comments) or ""
   for _, entry in ipairs(_split_csv(comments)) do
     if entry ~= "" then
       local leader = entry
@@ -69,7 +80,6 @@ local function _comment_leaders(bufnr)
     end
   end
 
-  local cs = (vim.bo[bufnr] and vim.bo[bufnr].commentstring) or ""
   if type(cs) == "string" and cs:find("%%s", 1, true) then
     local prefix = cs:match("^(.-)%%s")
     if prefix then
@@ -89,46 +99,79 @@ local function _comment_leaders(bufnr)
   return leaders
 end
 
-function M.is_comment_line(bufnr, text)
+local function _comment_leaders(bufnr)
+  local bo = vim.bo[bufnr]
+  local comments = (bo and bo.comments) or ""
+  local cs = (bo and bo.commentstring) or ""
+  local key = comments .. "\0" .. cs
+  local leaders = leaders_by_options[key]
+  if not leaders then
+    leaders = _parse_comment_leaders(comments, cs)
+    leaders_by_options[key] = leaders
+  end
+  return leaders
+end
+
+---@param leaders? string[] precomputed comment leaders for bufnr (see scan_line_predicate)
+function M.is_comment_line(bufnr, text, leaders)
   local s = text or ""
   s = s:gsub("^%s+", "")
   if s == "" then
     return false
   end
-  for _, leader in ipairs(_comment_leaders(bufnr)) do
-    if leader ~= "" then
-      local l = leader
-      local l2 = leader:gsub("%s+$", "")
-      if s:sub(1, #l) == l or (l2 ~= "" and s:sub(1, #l2) == l2) then
-        return true
-      end
+  -- Leaders are trimmed and non-empty when parsed, so a plain prefix compare suffices.
+  for _, leader in ipairs(leaders or _comment_leaders(bufnr)) do
+    if s:sub(1, #leader) == leader then
+      return true
     end
   end
   return false
 end
 
-function M.is_scan_line(bufnr, text)
+function M.require_trailing_backslash(bufnr)
+  local bval = vim.b[bufnr] and vim.b[bufnr].metermeter_require_trailing_backslash
+  if bval ~= nil then
+    return (bval == true or bval == 1 or bval == "1")
+  end
+  local gval = vim.g.metermeter_require_trailing_backslash
+  if gval ~= nil then
+    return (gval == true or gval == 1 or gval == "1")
+  end
+  return config.cfg.require_trailing_backslash and true or false
+end
+
+local function _is_scan_line(bufnr, text, require_backslash, leaders)
   local s = vim.trim(text or "")
   if s == "" then
     return false
   end
-  if M.is_comment_line(bufnr, s) then
+  if M.is_comment_line(bufnr, s, leaders) then
     return false
   end
-  local require_backslash = config.cfg.require_trailing_backslash and true or false
-  local bval = vim.b[bufnr] and vim.b[bufnr].metermeter_require_trailing_backslash
-  if bval ~= nil then
-    require_backslash = (bval == true or bval == 1 or bval == "1")
-  else
-    local gval = vim.g.metermeter_require_trailing_backslash
-    if gval ~= nil then
-      require_backslash = (gval == true or gval == 1 or gval == "1")
-    end
-  end
   if require_backslash then
     return s:match("\\$") ~= nil
   end
   return true
 end
 
+function M.is_scan_line(bufnr, text)
+  return _is_scan_line(bufnr, text, M.require_trailing_backslash(bufnr))
+end
+
+--- Like is_scan_line, but with the buffer/global/config settings and comment leaders
+--- resolved once up front. Use for loops over many lines of one buffer; same
+--- (bufnr, text) call signature.
+---@return fun(bufnr: integer, text: string): boolean
+---@return string settings_key equal keys mean the predicate classifies lines identically
+function M.scan_line_predicate(bufnr)
+  local require_backslash = M.require_trailing_backslash(bufnr)
+  local leaders = _comment_leaders(bufnr)
+  -- Leader lists are memoized per option value, so their identity stands in for them.
+  local settings_key = (require_backslash and "1" or "0") .. tostring(leaders)
+  local function predicate(_, text)
+    return _is_scan_line(bufnr, text, require_backslash, leaders)
+  end
+  return predicate, settings_key
+end
+
 return M
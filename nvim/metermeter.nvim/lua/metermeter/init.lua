@@ -2,15 +2,19 @@ local uv = vim.uv or vim.loop
 
 local M = {}
 local config = require("metermeter.config")
-local engine = require("metermeter.engine")
 local filter = require("metermeter.filter")
 local highlight = require("metermeter.highlight")
 local render = require("metermeter.render")
 local state_mod = require("metermeter.state")
-local subprocess = require("metermeter.subprocess")
+
+-- The scan engine (with the scanner, cache and worker modules it pulls in) is only
+-- needed once some buffer is enabled; setup() runs at every startup, poem or not.
+local function engine()
+  return require("metermeter.engine")
+end
 
 local state_by_buf = {}
-local subprocess_cmd
+local subprocess_cmd -- resolved on first enable
 
 local function ensure_state(bufnr)
   local st = state_by_buf[bufnr]
@@ -56,23 +60,33 @@ local function cleanup_buf(bufnr)
 end
 
 local function start_scan(bufnr)
-  engine.do_scan(bufnr, state_by_buf, subprocess_cmd)
+  engine().do_scan(bufnr, state_by_buf, subprocess_cmd)
 end
 
 local function schedule_scan(bufnr)
   local st = ensure_state(bufnr)
-  if st.timer then
-    st.timer:stop()
-    st.timer:close()
-    st.timer = nil
-  end
-  st.timer = uv.new_timer()
   local ms = tonumber(config.cfg.debounce_ms) or 80
-  st.timer:start(ms, 0, function()
+  -- Debounce with a deadline on one long-lived timer per buffer: each call only pushes
+  -- st.scan_deadline out, and the timer re-checks it when it fires, so a typing burst
+  -- costs a single wakeup per debounce interval instead of a timer restart per keystroke.
+  st.scan_deadline = uv.now() + ms
+  if not st.timer then
+    st.timer = uv.new_timer()
+  elseif st.timer:is_active() then
+    return
+  end
+  local timer = st.timer
+  local function fire()
+    local remaining = st.scan_deadline - uv.now()
+    if remaining > 0 then
+      timer:start(remaining, 0, fire)
+      return
+    end
     vim.schedule(function()
       start_scan(bufnr)
     end)
-  end)
+  end
+  timer:start(ms, 0, fire)
 end
 
 local function ensure_tick(bufnr)
@@ -114,7 +128,11 @@ function M.enable(bufnr, user)
   st.dominant_total_weight = 0
   st.last_changedtick = -1
   st.last_view_sig = ""
-  engine.refresh_statusline()
+  engine().refresh_statusline(st)
+  -- Start the worker now so interpreter and prosodic startup overlap the debounce
+  -- instead of delaying the first scan.
+  subprocess_cmd = subprocess_cmd or engine().default_subprocess_cmd()
+  require("metermeter.subprocess").ensure_running(subprocess_cmd)
   ensure_tick(bufnr)
   schedule_scan(bufnr)
 end
@@ -136,7 +154,7 @@ function M.disable(bufnr, user)
   state_mod.stop_scan_state(st)
   _cleanup_timers(st)
   render.clear_buf(bufnr)
-  engine.refresh_statusline()
+  engine().refresh_statusline(st)
 end
 
 ---@param bufnr integer Buffer number (0 for current buffer)
@@ -160,13 +178,22 @@ function M.statusline(bufnr)
   if not st or not st.enabled then
     return ""
   end
-  if st.last_error then
-    local msg = tostring(st.last_error)
+  -- Evaluated on every statusline redraw; only rebuild when the meter or error changes.
+  local err, meter = st.last_error, st.dominant_meter
+  if st.statusline_text and st.statusline_error == err and st.statusline_meter == meter then
+    return st.statusline_text
+  end
+  local text
+  if err then
+    local msg = tostring(err)
     local short = msg:match("[%w]*Error[%w]*:[^\n]*") or msg:sub(1, 60)
-    return "MM: error: " .. short
+    text = "MM: error: " .. short
+  else
+    local m = tostring(meter or "")
+    text = "MM: " .. (m ~= "" and m or "…")
   end
-  local meter = tostring(st.dominant_meter or "")
-  return "MM: " .. (meter ~= "" and meter or "…")
+  st.statusline_text, st.statusline_error, st.statusline_meter = text, err, meter
+  return text
 end
 
 function M._debug_stats(bufnr)
@@ -199,6 +226,7 @@ function M.rescan(bufnr)
   st.last_render_sig = ""
   state_mod.stop_scan_state(st)
   render.clear_buf(bufnr)
+  engine().refresh_statusline(st)
   schedule_scan(bufnr)
 end
 
@@ -206,7 +234,8 @@ end
 function M.debug_dump(bufnr)
   bufnr = (bufnr == 0) and vim.api.nvim_get_current_buf() or bufnr
   local st = ensure_state(bufnr)
-  local ft = (vim.bo[bufnr] and vim.bo[bufnr].filetype) or ""
+  local bo = vim.bo[bufnr]
+  local ft = (bo and bo.filetype) or ""
   local auto_on = filter.should_enable(bufnr)
 
   -- Always emit a summary line so this is useful even when disabled.
@@ -257,18 +286,31 @@ function M.debug_dump(bufnr)
   local cfg = config.cfg
   local path = cfg.debug_dump_path or "/tmp/metermeter_nvim_dump.json"
   local ok, enc = pcall(vim.json.encode, out)
-  if ok then
-    local f = io.open(path, "w")
-    if f then
-      f:write(enc)
-      f:close()
-      vim.notify("MeterMeter: full dump written to " .. path, vim.log.levels.INFO)
-    else
-      vim.notify("MeterMeter: could not write to " .. path, vim.log.levels.WARN)
-    end
-  else
+  if not ok then
     vim.notify("MeterMeter: failed to encode dump: " .. tostring(enc), vim.log.levels.WARN)
+    return
   end
+  -- The dump can be large (every extmark); write it off the main loop.
+  local function report(err)
+    vim.schedule(function()
+      if err then
+        vim.notify("MeterMeter: could not write to " .. path, vim.log.levels.WARN)
+      else
+        vim.notify("MeterMeter: full dump written to " .. path, vim.log.levels.INFO)
+      end
+    end)
+  end
+  uv.fs_open(path, "w", 420, function(open_err, fd) -- 420 = 0644
+    if open_err or not fd then
+      report(open_err or "open failed")
+      return
+    end
+    uv.fs_write(fd, enc, -1, function(write_err)
+      uv.fs_close(fd, function()
+        report(write_err)
+      end)
+    end)
+  end)
 end
 
 ---@param opts? table Configuration overrides (see DEFAULTS)
@@ -279,7 +321,6 @@ function M.setup(opts)
   end
 
   config.apply(opts)
-  subprocess_cmd = engine.default_subprocess_cmd()
 
   highlight.compute_stress_hl()
   highlight.compute_eol_hls()
@@ -295,7 +336,11 @@ function M.setup(opts)
   vim.api.nvim_create_autocmd("VimLeavePre", {
     group = group,
     callback = function()
-      subprocess.shutdown()
+      -- Never loaded means no worker was ever started.
+      local subprocess = package.loaded["metermeter.subprocess"]
+      if subprocess then
+        subprocess.shutdown()
+      end
     end,
   })
   vim.api.nvim_create_autocmd({ "BufReadPost", "BufNewFile", "BufEnter" }, {
@@ -313,16 +358,14 @@ function M.setup(opts)
   vim.api.nvim_create_autocmd("FileType", {
     group = group,
     callback = function(args)
+      local st = state_by_buf[args.buf]
+      local enabled = st ~= nil and st.enabled
       if should_run_for_buf(args.buf) then
-        local st = state_by_buf[args.buf]
-        if not st or not st.enabled then
+        if not enabled then
           M.enable(args.buf)
         end
-      else
-        local st = state_by_buf[args.buf]
-        if st and st.enabled then
-          M.disable(args.buf)
-        end
+      elseif enabled then
+        M.disable(args.buf)
       end
     end,
   })
@@ -330,9 +373,19 @@ function M.setup(opts)
     group = group,
     callback = function(args)
       local st = state_by_buf[args.buf]
-      if st and st.enabled then
-        schedule_scan(args.buf)
+      if not st or not st.enabled then
+        return
+      end
+      if args.event == "WinScrolled" then
+        -- Horizontal-only scrolls change no visible rows, cursor or width (all that
+        -- the viewport signature tracks), so there is nothing to rescan. A skipcol
+        -- change ('smoothscroll' through a wrapped line) can change w$, so it counts.
+        local all = vim.v.event and vim.v.event.all
+        if type(all) == "table" and all.topline == 0 and all.skipcol == 0 and all.height == 0 and all.width == 0 then
+          return
+        end
       end
+      schedule_scan(args.buf)
     end,
   })
   vim.api.nvim_create_autocmd({ "BufWipeout", "BufDelete" }, {
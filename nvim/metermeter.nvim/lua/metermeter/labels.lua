@@ -20,7 +20,7 @@ local LINE_ABBREV = {
 
 local function _details_mode()
   local mode = config.cfg and config.cfg.ui and config.cfg.ui.meter_hint_details
-  if mode == "off" or mode == "always" or mode == "deviations" then
+  if config.METER_HINT_DETAIL_MODES[mode] then
     return mode
   end
   return "deviations"
@@ -30,23 +30,41 @@ local function _abbrev_enabled()
   return config.cfg and config.cfg.ui and config.cfg.ui.meter_hint_abbrev == true
 end
 
----@param meter_name string
----@return string
-function M.abbrev_meter_name(meter_name)
-  local foot, line = tostring(meter_name or ""):match("^%s*(%S+)%s+(%S+)%s*$")
+-- Abbreviations keyed by full meter name; labels are rebuilt for every result on
+-- every render, but only a couple dozen distinct meter names exist.
+local abbrev_by_name = {}
+
+local function _abbrev(name)
+  local foot, line = name:match("^%s*(%S+)%s+(%S+)%s*$")
   if not foot or not line then
-    return tostring(meter_name or "")
+    return name
   end
-  foot = foot:lower()
-  line = line:lower()
-  local foot_abbrev = FOOT_ABBREV[foot]
-  local line_abbrev = LINE_ABBREV[line]
+  local foot_abbrev = FOOT_ABBREV[foot:lower()]
+  local line_abbrev = LINE_ABBREV[line:lower()]
   if foot_abbrev and line_abbrev then
     return foot_abbrev .. line_abbrev
   end
-  return tostring(meter_name or "")
+  return name
+end
+
+---@param meter_name string
+---@return string
+function M.abbrev_meter_name(meter_name)
+  local name = tostring(meter_name or "")
+  local abbrev = abbrev_by_name[name]
+  if not abbrev then
+    abbrev = _abbrev(name)
+    abbrev_by_name[name] = abbrev
+  end
+  return abbrev
 end
 
+-- meter_hint runs for every result on every render; read its two settings once per
+-- config version rather than walking config.cfg.ui on each call.
+local settings_version = nil
+local abbrev_on = false
+local details_mode = "deviations"
+
 ---@param item table
 ---@return string
 function M.meter_hint(item)
@@ -54,11 +72,16 @@ function M.meter_hint(item)
   if meter_name == "" then
     return ""
   end
-  if _abbrev_enabled() then
+  if settings_version ~= config.version then
+    abbrev_on = _abbrev_enabled()
+    details_mode = _details_mode()
+    settings_version = config.version
+  end
+  if abbrev_on then
     meter_name = M.abbrev_meter_name(meter_name)
   end
 
-  local mode = _details_mode()
+  local mode = details_mode
   if mode == "off" then
     return meter_name
   end
@@ -12,7 +12,30 @@ local SPINNER = { "⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇",
 -- Expose namespace for debug_dump extmark queries.
 M.ns = ns
 
+-- Extmark option templates: the static fields are built once, and only the per-mark
+-- fields are filled in before each call (nvim_buf_set_extmark copies its opts).
+local hint_opts = {
+  -- Left-aligned, but starting in a consistent column across all annotated lines.
+  virt_text_pos = "overlay",
+  virt_text_win_col = 0,
+}
+local stress_opts = {
+  end_col = 0,
+  hl_group = "MeterMeterStress",
+  hl_mode = "combine",
+}
+local loading_opts = {
+  virt_text_pos = "overlay",
+  virt_text_win_col = 0,
+}
+
+-- What apply_results last drew per buffer: the changedtick and hint column it was
+-- drawn for, plus per line { sig = annotation signature, ids = extmark ids (hint
+-- first, if any), hint = has a hint mark, cols = stress column pairs }.
+local rendered_by_buf = {}
+
 function M.clear_buf(bufnr)
+  rendered_by_buf[bufnr] = nil
   if not vim.api.nvim_buf_is_valid(bufnr) then
     return
   end
@@ -27,34 +50,20 @@ local function _clear_loading(bufnr)
   vim.api.nvim_buf_clear_namespace(bufnr, loading_ns, 0, -1)
 end
 
-function M.refresh_loading(bufnr, state_by_buf)
-  if not vim.api.nvim_buf_is_valid(bufnr) then
-    return
-  end
-  _clear_loading(bufnr)
-
-  local st = state_by_buf[bufnr]
-  if not st then
-    return
+-- Display width of a line. Printable ASCII (no tabs or control characters) is one
+-- cell per byte, which covers most verse without a round trip into strdisplaywidth().
+local function _display_width(text)
+  if not text:find("[^\32-\126]") then
+    return #text
   end
-  st.spinner_frame = (st.spinner_frame + 1) % #SPINNER
-  local spinner_char = SPINNER[st.spinner_frame + 1]
+  local w = vim.fn.strdisplaywidth(text)
+  return type(w) == "number" and w or 0
+end
 
-  -- Determine the column alignment based on the widest visible line
-  local max_w = 0
-  local line_count = vim.api.nvim_buf_line_count(bufnr)
-  for _, lnum in ipairs(st.pending_lnums or {}) do
-    if lnum >= 0 and lnum < line_count then
-      local text = (vim.api.nvim_buf_get_lines(bufnr, lnum, lnum + 1, false)[1] or "")
-      local w = vim.fn.strdisplaywidth(text)
-      if type(w) == "number" and w > max_w then
-        max_w = w
-      end
-    end
-  end
+-- Column just past the widest line (max_w display cells), clamped to the first
+-- window showing the buffer so marks are never placed completely offscreen.
+local function _eol_col(bufnr, max_w)
   local eol_col = max_w + 1
-
-  -- Clamp to window width
   local wins = vim.fn.win_findbuf(bufnr)
   if type(wins) == "table" then
     for _, win in ipairs(wins) do
@@ -68,25 +77,75 @@ function M.refresh_loading(bufnr, state_by_buf)
       end
     end
   end
+  return eol_col
+end
+
+-- Display width of the widest pending line, which the spinner column aligns past.
+local function _pending_max_width(bufnr, pending_lnums)
+  local max_w = 0
+  local line_count = vim.api.nvim_buf_line_count(bufnr)
+  for _, lnum in ipairs(pending_lnums) do
+    if lnum >= 0 and lnum < line_count then
+      local text = (vim.api.nvim_buf_get_lines(bufnr, lnum, lnum + 1, false)[1] or "")
+      local w = _display_width(text)
+      if w > max_w then
+        max_w = w
+      end
+    end
+  end
+  return max_w
+end
+
+function M.refresh_loading(bufnr, state_by_buf)
+  if not vim.api.nvim_buf_is_valid(bufnr) then
+    return
+  end
+
+  local st = state_by_buf[bufnr]
+  if not st then
+    _clear_loading(bufnr)
+    return
+  end
+  if st.loading_shown then
+    _clear_loading(bufnr)
+  end
+  st.spinner_frame = (st.spinner_frame + 1) % #SPINNER
+  local spinner_char = SPINNER[st.spinner_frame + 1]
+
+  -- The pending list is replaced wholesale whenever it changes, so its lines only
+  -- need measuring for a new list or after an edit, not on every spinner frame. The
+  -- window clamp is redone per frame, so resizes and splits move the spinner too.
+  local pending_lnums = st.pending_lnums or {}
+  local tick = vim.api.nvim_buf_get_changedtick(bufnr)
+  if st.loading_max_w_lnums ~= pending_lnums or st.loading_max_w_tick ~= tick then
+    st.loading_max_w = _pending_max_width(bufnr, pending_lnums)
+    st.loading_max_w_lnums = pending_lnums
+    st.loading_max_w_tick = tick
+  end
+  local eol_col = _eol_col(bufnr, st.loading_max_w)
 
-  for _, lnum in ipairs(st.pending_lnums or {}) do
-    vim.api.nvim_buf_set_extmark(bufnr, loading_ns, lnum, 0, {
-      virt_text = { { " " .. spinner_char, "MeterMeterLoading" } },
-      virt_text_pos = "overlay",
-      virt_text_win_col = eol_col,
-    })
+  loading_opts.virt_text = { { " " .. spinner_char, "MeterMeterLoading" } }
+  loading_opts.virt_text_win_col = eol_col
+  for _, lnum in ipairs(pending_lnums) do
+    vim.api.nvim_buf_set_extmark(bufnr, loading_ns, lnum, 0, loading_opts)
   end
+  st.loading_shown = #pending_lnums > 0
 
   -- Start the per-buffer spinner timer if not running
   if not st.loading_timer then
     st.loading_timer = uv.new_timer()
     st.loading_timer:start(100, 100, function()
       vim.schedule(function()
-        if vim.api.nvim_buf_is_valid(bufnr) then
-          local st2 = state_by_buf[bufnr]
-          if st2 and #(st2.pending_lnums or {}) > 0 then
-            M.refresh_loading(bufnr, state_by_buf)
-          end
+        local st2 = state_by_buf[bufnr]
+        if not st2 then
+          return
+        end
+        if vim.api.nvim_buf_is_valid(bufnr) and #(st2.pending_lnums or {}) > 0 then
+          M.refresh_loading(bufnr, state_by_buf)
+        else
+          -- Nothing left to animate (e.g. pending was reset for a context rescan):
+          -- stop ticking instead of waking every 100ms until the next scan.
+          M.stop_loading(bufnr, state_by_buf)
         end
       end)
     end)
@@ -101,80 +160,183 @@ function M.stop_loading(bufnr, state_by_buf)
       st.loading_timer:close()
       st.loading_timer = nil
     end
-    _clear_loading(bufnr)
+    -- Called at the end of every scan phase; most of the time there is nothing to clear.
+    if st.loading_shown then
+      _clear_loading(bufnr)
+      st.loading_shown = false
+    end
+  end
+end
+
+-- Stress column pairs { s1, e1, s2, e2, ... } for item, clamped to the line length.
+local function _stress_cols(bufnr, item, lnum, line_count)
+  local cols = {}
+  if type(item.stress_spans) ~= "table" or lnum < 0 or lnum >= line_count then
+    return cols
+  end
+  -- item.text was read from the buffer when the results were merged, just now.
+  local line_bytes = type(item.text) == "string" and #item.text
+    or #(vim.api.nvim_buf_get_lines(bufnr, lnum, lnum + 1, false)[1] or "")
+  for _, span in ipairs(item.stress_spans) do
+    local s = tonumber(span[1])
+    local e = tonumber(span[2])
+    if s and e then
+      s = math.max(0, math.min(line_bytes, s))
+      e = math.max(0, math.min(line_bytes, e))
+    end
+    if s and e and e > s then
+      cols[#cols + 1] = s
+      cols[#cols + 1] = e
+    end
+  end
+  return cols
+end
+
+-- After an edit, extmarks have moved along with the text. Re-key each line's record
+-- by the row its marks sit on now, keeping it only if every mark is still exactly
+-- where the record says (a line edited in place shifts its stress marks; a deleted
+-- line's marks collapse onto the next row). Marks of dropped records are deleted.
+local function _relocate_rendered(bufnr, prev_lines)
+  local pos_by_id = {}
+  for _, m in ipairs(vim.api.nvim_buf_get_extmarks(bufnr, ns, 0, -1, { details = true })) do
+    pos_by_id[m[1]] = m
+  end
+  local by_row = {}
+  local stale = {}
+  for _, rec in pairs(prev_lines) do
+    local row
+    local ok = #rec.ids > 0
+    local first_stress = rec.hint and 2 or 1
+    if ok and rec.hint then
+      local m = pos_by_id[rec.ids[1]]
+      ok = m ~= nil and m[3] == 0
+      row = m and m[2]
+    end
+    for i = first_stress, #rec.ids do
+      if not ok then
+        break
+      end
+      local m = pos_by_id[rec.ids[i]]
+      local c = 2 * (i - first_stress) + 1
+      local d = m and m[4]
+      row = row or (m and m[2])
+      ok = m ~= nil
+        and m[2] == row
+        and m[3] == rec.cols[c]
+        and d.end_row == row
+        and d.end_col == rec.cols[c + 1]
+    end
+    if ok and by_row[row] then
+      -- Two lines' marks ended up on one row; neither can be trusted.
+      stale[#stale + 1] = by_row[row]
+      by_row[row] = false
+      ok = false
+    end
+    if ok and by_row[row] == nil then
+      by_row[row] = rec
+    else
+      stale[#stale + 1] = rec
+    end
+  end
+  for _, rec in ipairs(stale) do
+    for _, id in ipairs(rec.ids) do
+      vim.api.nvim_buf_del_extmark(bufnr, ns, id)
+    end
   end
+  local out = {}
+  for row, rec in pairs(by_row) do
+    if rec then
+      out[row] = rec
+    end
+  end
+  return out
 end
 
 function M.apply_results(bufnr, results)
-  M.clear_buf(bufnr)
+  -- Only replace annotations; loading marks are owned by refresh_loading/stop_loading
+  -- and clearing them here just made the spinner blink until its next frame.
+  if not vim.api.nvim_buf_is_valid(bufnr) then
+    rendered_by_buf[bufnr] = nil
+    return
+  end
   if not results then
+    vim.api.nvim_buf_clear_namespace(bufnr, ns, 0, -1)
+    rendered_by_buf[bufnr] = nil
     return
   end
-  local cfg = config.cfg
+  -- Snapshot the ui switches once rather than re-walking config.cfg.ui per line.
+  local ui = config.cfg.ui
+  local show_hints = ui.meter_hints
+  local show_stress = ui.stress
   -- Align meter hints at a consistent column (left-aligned), based on the widest annotated line.
   local max_w = 0
   for _, item in ipairs(results) do
     if type(item) == "table" and type(item.text) == "string" then
-      local w = vim.fn.strdisplaywidth(item.text)
-      if type(w) == "number" and w > max_w then
+      local w = _display_width(item.text)
+      if w > max_w then
         max_w = w
       end
     end
   end
-  local eol_col = max_w + 1
-  local wins = vim.fn.win_findbuf(bufnr)
-  if type(wins) == "table" then
-    for _, win in ipairs(wins) do
-      win = tonumber(win) or win
-      if type(win) == "number" and vim.api.nvim_win_is_valid(win) then
-        local ww = vim.api.nvim_win_get_width(win)
-        if type(ww) == "number" and ww > 1 then
-          -- Clamp to avoid placing completely offscreen.
-          eol_col = math.min(eol_col, ww - 1)
-        end
-        break
-      end
+  local eol_col = _eol_col(bufnr, max_w)
+  hint_opts.virt_text_win_col = eol_col
+  local line_count = vim.api.nvim_buf_line_count(bufnr)
+
+  -- Successive renders (scan phases filling in, scrolling, edits) mostly redraw the
+  -- same lines. Keep each line's marks when its annotation is identical and only
+  -- replace the lines that differ; a new hint column moves every hint, so start over.
+  local tick = vim.api.nvim_buf_get_changedtick(bufnr)
+  local prev = rendered_by_buf[bufnr]
+  local prev_lines
+  if prev and prev.eol_col == eol_col then
+    prev_lines = prev.lines
+    if prev.tick ~= tick then
+      prev_lines = _relocate_rendered(bufnr, prev_lines)
     end
+  else
+    vim.api.nvim_buf_clear_namespace(bufnr, ns, 0, -1)
+    prev_lines = {}
   end
 
+  local lines = {}
+  -- Validity was checked on entry and nothing below can delete the buffer.
   for _, item in ipairs(results) do
     local lnum = tonumber(item.lnum)
-    if lnum and vim.api.nvim_buf_is_valid(bufnr) then
-      local conf = item.confidence
-      local label = labels.meter_hint(item)
-      if cfg.ui.meter_hints and label ~= "" then
-        local hl = highlight.eol_hl_for_conf(conf)
-        vim.api.nvim_buf_set_extmark(bufnr, ns, lnum, 0, {
-          virt_text = { { " " .. label, hl } },
-          -- Left-aligned, but starting in a consistent column across all annotated lines.
-          virt_text_pos = "overlay",
-          virt_text_win_col = eol_col,
-        })
-      end
-      if cfg.ui.stress and type(item.stress_spans) == "table" then
-        local line_count = vim.api.nvim_buf_line_count(bufnr)
-        if lnum >= 0 and lnum < line_count then
-          local line_text = (vim.api.nvim_buf_get_lines(bufnr, lnum, lnum + 1, false)[1] or "")
-          local line_bytes = #line_text
-          for _, span in ipairs(item.stress_spans) do
-            local s = tonumber(span[1])
-            local e = tonumber(span[2])
-            if s and e then
-              s = math.max(0, math.min(line_bytes, s))
-              e = math.max(0, math.min(line_bytes, e))
-            end
-            if s and e and e > s then
-              vim.api.nvim_buf_set_extmark(bufnr, ns, lnum, s, {
-                end_col = e,
-                hl_group = "MeterMeterStress",
-                hl_mode = "combine",
-              })
-            end
+    if lnum and not lines[lnum] then
+      local label = show_hints and labels.meter_hint(item) or ""
+      local hl = label ~= "" and highlight.eol_hl_for_conf(item.confidence) or ""
+      local cols = show_stress and _stress_cols(bufnr, item, lnum, line_count) or {}
+      local sig = label .. "\0" .. hl .. "\0" .. table.concat(cols, ",")
+      local old = prev_lines[lnum]
+      prev_lines[lnum] = nil
+      if old and old.sig == sig then
+        lines[lnum] = old
+      else
+        if old then
+          for _, id in ipairs(old.ids) do
+            vim.api.nvim_buf_del_extmark(bufnr, ns, id)
           end
         end
+        local ids = {}
+        if label ~= "" then
+          hint_opts.virt_text = { { " " .. label, hl } }
+          ids[#ids + 1] = vim.api.nvim_buf_set_extmark(bufnr, ns, lnum, 0, hint_opts)
+        end
+        for i = 1, #cols, 2 do
+          stress_opts.end_col = cols[i + 1]
+          ids[#ids + 1] = vim.api.nvim_buf_set_extmark(bufnr, ns, lnum, cols[i], stress_opts)
+        end
+        lines[lnum] = { sig = sig, ids = ids, hint = label ~= "", cols = cols }
       end
     end
   end
+  -- Lines annotated last time but not in this result set.
+  for _, old in pairs(prev_lines) do
+    for _, id in ipairs(old.ids) do
+      vim.api.nvim_buf_del_extmark(bufnr, ns, id)
+    end
+  end
+  rendered_by_buf[bufnr] = { tick = tick, eol_col = eol_col, lines = lines }
 end
 
 return M
@@ -1,52 +1,122 @@
 local M = {}
 
-function M.candidate_line_set_for_buf(bufnr, prefetch)
-  local wins = vim.fn.win_findbuf(bufnr)
-  local visible = {}
-  local prefetch_set = {}
-  prefetch = tonumber(prefetch) or 0
-  local line_count = vim.api.nvim_buf_line_count(bufnr)
-  local max_row = math.max(0, line_count - 1)
-  for _, win in ipairs(wins) do
+local function _append_range(out, a, b)
+  for l = a, b do
+    out[#out + 1] = l
+  end
+end
+
+--- Per-window viewport facts for every window showing bufnr: 1-based w0/w$ and
+--- cursor row, plus width. Gathered once per scan and shared by viewport_signature
+--- and candidate_line_set_for_buf, which would otherwise each query every window.
+function M.window_views(bufnr)
+  local views = {}
+  for _, win in ipairs(vim.fn.win_findbuf(bufnr)) do
     win = tonumber(win) or win
     if type(win) == "number" and vim.api.nvim_win_is_valid(win) then
       local w0, w1 = vim.api.nvim_win_call(win, function()
         return vim.fn.line("w0"), vim.fn.line("w$")
       end)
-      w0 = (tonumber(w0) or 1) - 1
-      w1 = (tonumber(w1) or (w0 + 1)) - 1
-      if w1 < w0 then
-        w0, w1 = w1, w0
-      end
-      for l = w0, w1 do
-        visible[l] = true
+      local cur = vim.api.nvim_win_get_cursor(win)
+      views[#views + 1] = {
+        w0 = w0,
+        w1 = w1,
+        cursor_row = cur and cur[1],
+        width = vim.api.nvim_win_get_width(win),
+      }
+    end
+  end
+  return views
+end
+
+-- Sort { first, last } ranges and coalesce overlapping or adjacent ones.
+local function _merge_ranges(ranges)
+  table.sort(ranges, function(x, y)
+    return x[1] < y[1]
+  end)
+  local out = {}
+  for _, r in ipairs(ranges) do
+    local last = out[#out]
+    if last and r[1] <= last[2] + 1 then
+      if r[2] > last[2] then
+        last[2] = r[2]
       end
+    else
+      out[#out + 1] = { r[1], r[2] }
+    end
+  end
+  return out
+end
 
-      if prefetch > 0 then
-        local cur = vim.api.nvim_win_get_cursor(win)
-        local row = (cur and cur[1] and tonumber(cur[1]) or 1) - 1
-        local a = math.max(0, row - prefetch)
-        local b = math.min(max_row, row + prefetch)
-        for l = a, b do
-          if not visible[l] then
-            prefetch_set[l] = true
-          end
-        end
+---@param views? table[] from window_views; queried when absent
+function M.candidate_line_set_for_buf(bufnr, prefetch, views)
+  views = views or M.window_views(bufnr)
+  prefetch = tonumber(prefetch) or 0
+  local line_count = vim.api.nvim_buf_line_count(bufnr)
+  local max_row = math.max(0, line_count - 1)
+  local visible_ranges = {}
+  local prefetch_ranges = {}
+  for _, view in ipairs(views) do
+    local w0 = (tonumber(view.w0) or 1) - 1
+    local w1 = (tonumber(view.w1) or (w0 + 1)) - 1
+    if w1 < w0 then
+      w0, w1 = w1, w0
+    end
+
+    local a, b
+    if prefetch > 0 then
+      local row = (tonumber(view.cursor_row) or 1) - 1
+      a = math.max(0, row - prefetch)
+      b = math.min(max_row, row + prefetch)
+    end
+
+    if #views == 1 then
+      -- Common case: one window, so both sets are contiguous ranges and can be
+      -- emitted in order directly, without the merge below.
+      local visible_lines = {}
+      _append_range(visible_lines, w0, w1)
+      local prefetch_lines = {}
+      if a then
+        _append_range(prefetch_lines, a, math.min(b, w0 - 1))
+        _append_range(prefetch_lines, math.max(a, w1 + 1), b)
       end
+      return visible_lines, prefetch_lines
+    end
+
+    visible_ranges[#visible_ranges + 1] = { w0, w1 }
+    if a and a <= b then
+      prefetch_ranges[#prefetch_ranges + 1] = { a, b }
     end
   end
 
+  -- Several windows: work on merged row ranges rather than per-row sets, so the cost
+  -- follows the number of windows instead of the number of rows they show.
+  visible_ranges = _merge_ranges(visible_ranges)
   local visible_lines = {}
-  for lnum, _ in pairs(visible) do
-    table.insert(visible_lines, lnum)
+  for _, r in ipairs(visible_ranges) do
+    _append_range(visible_lines, r[1], r[2])
   end
-  table.sort(visible_lines)
 
+  -- Prefetch rows not visible in any window; both range lists are sorted, so one
+  -- forward walk over the visible ranges covers every prefetch range.
   local prefetch_lines = {}
-  for lnum, _ in pairs(prefetch_set) do
-    table.insert(prefetch_lines, lnum)
+  local j = 1
+  for _, r in ipairs(_merge_ranges(prefetch_ranges)) do
+    local l = r[1]
+    while l <= r[2] do
+      while visible_ranges[j] and visible_ranges[j][2] < l do
+        j = j + 1
+      end
+      local v = visible_ranges[j]
+      if v and v[1] <= l then
+        l = v[2] + 1
+      else
+        local stop = v and math.min(r[2], v[1] - 1) or r[2]
+        _append_range(prefetch_lines, l, stop)
+        l = stop + 1
+      end
+    end
   end
-  table.sort(prefetch_lines)
 
   return visible_lines, prefetch_lines
 end
@@ -69,23 +139,28 @@ function M.combine_lines(visible_lines, prefetch_lines)
   return out
 end
 
-function M.all_scan_lines_for_buf(bufnr, is_scan_line)
+---@param lines? string[] the buffer's lines, if the caller already has them
+function M.all_scan_lines_for_buf(bufnr, is_scan_line, lines)
   local out = {}
-  local line_count = vim.api.nvim_buf_line_count(bufnr)
-  for lnum = 0, line_count - 1 do
-    local text = (vim.api.nvim_buf_get_lines(bufnr, lnum, lnum + 1, false)[1] or "")
+  -- One API call for the whole buffer rather than one per line.
+  lines = lines or vim.api.nvim_buf_get_lines(bufnr, 0, -1, false)
+  for i, text in ipairs(lines) do
     if is_scan_line(bufnr, text) then
-      table.insert(out, lnum)
+      out[#out + 1] = i - 1
     end
   end
   return out
 end
 
-function M.subtract_lines(base_lines, remove_lines)
+---@param more_remove_lines? integer[] also removed; saves callers combining the two lists first
+function M.subtract_lines(base_lines, remove_lines, more_remove_lines)
   local seen = {}
   for _, lnum in ipairs(remove_lines or {}) do
     seen[lnum] = true
   end
+  for _, lnum in ipairs(more_remove_lines or {}) do
+    seen[lnum] = true
+  end
   local out = {}
   for _, lnum in ipairs(base_lines or {}) do
     if not seen[lnum] then
@@ -95,33 +170,31 @@ function M.subtract_lines(base_lines, remove_lines)
   return out
 end
 
-function M.viewport_signature(bufnr)
-  local wins = vim.fn.win_findbuf(bufnr)
-  if type(wins) ~= "table" or #wins == 0 then
+---@param views? table[] from window_views; queried when absent
+function M.viewport_signature(bufnr, views)
+  views = views or M.window_views(bufnr)
+  if #views == 0 then
     return "no-win"
   end
   local parts = {}
-  for _, win in ipairs(wins) do
-    win = tonumber(win) or win
-    if type(win) == "number" and vim.api.nvim_win_is_valid(win) then
-      local w0, w1 = vim.api.nvim_win_call(win, function()
-        return vim.fn.line("w0"), vim.fn.line("w$")
-      end)
-      local cur = vim.api.nvim_win_get_cursor(win)
-      local ww = vim.api.nvim_win_get_width(win)
-      table.insert(
-        parts,
-        table.concat({
-          tostring(w0),
-          tostring(w1),
-          tostring(cur and cur[1] or 0),
-          tostring(ww or 0),
-        }, ":")
-      )
-    end
+  for _, view in ipairs(views) do
+    table.insert(
+      parts,
+      table.concat({
+        tostring(view.w0),
+        tostring(view.w1),
+        tostring(view.cursor_row or 0),
+        tostring(view.width or 0),
+      }, ":")
+    )
+  end
+  -- Sorting only makes the signature independent of window order, which needs at
+  -- least two windows; the usual single window skips it.
+  if #parts > 1 then
+    table.sort(parts)
+    return table.concat(parts, "|")
   end
-  table.sort(parts)
-  return table.concat(parts, "|")
+  return parts[1]
 end
 
 return M
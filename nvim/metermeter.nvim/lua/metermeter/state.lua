@@ -5,12 +5,17 @@ function M.new_state()
     enabled = false,
     user_enabled = nil, -- nil => auto by filetype, bool => explicit buffer override
     timer = nil,
+    scan_deadline = 0, -- uv.now() at which the pending debounce timer starts a scan
     tick = nil,
     cache = {},
     cache_size = 0,
     cache_seq = 0,
     cache_write_seq = 0,
     cache_epoch = 0,
+    cache_key_prefix = nil, -- key_for_text prefix for cache_key_epoch/_meter/_strength
+    cache_key_epoch = nil,
+    cache_key_meter = nil,
+    cache_key_strength = nil,
     analysis_context_meter = "",
     analysis_context_strength = 0,
     analysis_context_pass = 0, -- incremented when we auto-trigger a context rescan
@@ -20,7 +25,17 @@ function M.new_state()
     scan_changedtick = -1,
     last_changedtick = -1,
     last_view_sig = "",
+    scan_lines = {}, -- scan-line lnums for scan_lines_changedtick under filter settings scan_lines_filter_key
+    scan_lines_changedtick = -1,
+    scan_lines_filter_key = "",
     last_render_sig = "",
+    last_merge_sig = "", -- scan/changedtick/cache state behind last_merge_results
+    last_merge_lines = nil,
+    last_merge_results = nil,
+    last_status_sig = nil, -- enabled/dominant meter/error last pushed to the statusline
+    statusline_text = nil, -- memoized statusline() text for statusline_meter/statusline_error
+    statusline_meter = nil,
+    statusline_error = nil,
     dominant_meter = "",
     dominant_strength = 0,
     dominant_line_count = 0,
@@ -32,7 +47,11 @@ function M.new_state()
     pending_lnums = {},
     pending_keys = {}, -- lnum -> cache key (avoids extra buffer reads for spinner bookkeeping)
     spinner_frame = 0,
+    loading_max_w = 0, -- widest line in the pending_lnums list loading_max_w_lnums
+    loading_max_w_lnums = nil,
+    loading_max_w_tick = -1, -- changedtick loading_max_w was measured at
     loading_timer = nil,
+    loading_shown = false, -- spinner marks are currently placed in the loading namespace
   }
 end
 
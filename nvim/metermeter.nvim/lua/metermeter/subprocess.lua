@@ -10,7 +10,11 @@ local stdin_pipe = nil
 local stdout_pipe = nil
 local stderr_pipe = nil
 local pending = {} -- id -> callback
+local deadlines = {} -- id -> uv timer for the oldest outstanding request, if sent with a timeout
+local budgets = {} -- id -> timeout ms for requests queued behind older ones (clock not started)
 local next_id = 1
+local spawned_at = 0 -- uv.now() when the current worker was spawned
+local answered = false -- whether the current worker has sent any response yet
 local stdout_buf = ""
 local stderr_buf = ""
 
@@ -20,6 +24,10 @@ local MAX_RESTARTS = 3
 local RESTART_WINDOW_S = 60
 local MAX_STDOUT_BYTES = 512 * 1024
 local MAX_STDERR_BYTES = 16 * 1024
+-- Until its first response a worker is still importing prosodic and warming up, which
+-- can outlast any per-request deadline on a slow machine; only treat it as wedged once
+-- it has been silent this long since spawning.
+local STARTUP_GRACE_MS = 120000
 
 local function _spawn_env()
   local env = uv.os_environ()
@@ -70,47 +78,129 @@ local function _can_restart()
   return restart_count < MAX_RESTARTS
 end
 
+local _on_request_timeout
+
+local function _arm_deadline(id, timer, ms)
+  timer:start(ms, 0, function()
+    vim.schedule(function()
+      _on_request_timeout(id)
+    end)
+  end)
+end
+
+-- The worker answers requests in order, so a request's time budget only starts once
+-- everything sent before it has been answered; otherwise a small visible-phase request
+-- queued behind a large background one would time out against a healthy worker.
+local function _start_oldest_deadline()
+  local oldest
+  for id in pairs(pending) do
+    if not oldest or id < oldest then
+      oldest = id
+    end
+  end
+  local ms = oldest and budgets[oldest]
+  if ms then
+    budgets[oldest] = nil
+    local timer = uv.new_timer()
+    deadlines[oldest] = timer
+    _arm_deadline(oldest, timer, ms)
+  end
+end
+
+local function _take_pending(id)
+  local cb = pending[id]
+  pending[id] = nil
+  budgets[id] = nil
+  local timer = deadlines[id]
+  if timer then
+    deadlines[id] = nil
+    timer:stop()
+    _close_handle(timer)
+  end
+  _start_oldest_deadline()
+  return cb
+end
+
 local function _fail_all_pending(err)
-  local cbs = pending
-  pending = {}
-  for _, cb in pairs(cbs) do
+  -- Everything is failing at once; don't start deadlines for requests about to go.
+  budgets = {}
+  local ids = vim.tbl_keys(pending)
+  for _, id in ipairs(ids) do
+    local cb = _take_pending(id)
     vim.schedule(function()
       cb(nil, err)
     end)
   end
 end
 
+_on_request_timeout = function(id)
+  local timer = deadlines[id]
+  if not answered and timer then
+    -- Killing a worker that is merely slow to start would only respawn it into the
+    -- same start-up cost and burn through the restart limit.
+    local remaining = STARTUP_GRACE_MS - (uv.now() - spawned_at)
+    if remaining > 0 then
+      _arm_deadline(id, timer, remaining)
+      return
+    end
+  end
+  local cb = _take_pending(id)
+  if not cb then
+    return
+  end
+  cb(nil, "subprocess request timed out")
+  -- Only the oldest outstanding request has a running deadline, so the worker has
+  -- stopped answering altogether: it is wedged. Kill it so the next scan respawns it
+  -- (still bounded by the restart limit).
+  if proc then
+    pcall(uv.process_kill, proc, "sigterm")
+  end
+end
+
 local function _on_stderr_data(data)
   if data then
     stderr_buf = _cap_tail(stderr_buf .. data, MAX_STDERR_BYTES)
   end
 end
 
+local function _dispatch_line(line)
+  local ok, obj = pcall(vim.json.decode, line)
+  if ok and type(obj) == "table" and obj.id then
+    answered = true
+    local cb = _take_pending(obj.id)
+    if cb then
+      vim.schedule(function()
+        cb(obj, nil)
+      end)
+    end
+  end
+end
+
 local function _on_stdout_data(data)
   if not data then
     return
   end
-  stdout_buf = _cap_tail(stdout_buf .. data, MAX_STDOUT_BYTES)
+  -- Walk complete lines with a cursor instead of re-slicing the remaining buffer after
+  -- each one; only the unterminated tail is kept for the next chunk.
+  local buf = stdout_buf == "" and data or (stdout_buf .. data)
+  local pos = 1
   while true do
-    local nl = stdout_buf:find("\n", 1, true)
+    local nl = buf:find("\n", pos, true)
     if not nl then
       break
     end
-    local line = stdout_buf:sub(1, nl - 1)
-    stdout_buf = stdout_buf:sub(nl + 1)
-    if line ~= "" then
-      local ok, obj = pcall(vim.json.decode, line)
-      if ok and type(obj) == "table" and obj.id then
-        local cb = pending[obj.id]
-        if cb then
-          pending[obj.id] = nil
-          vim.schedule(function()
-            cb(obj, nil)
-          end)
-        end
-      end
+    if nl > pos then
+      _dispatch_line(buf:sub(pos, nl - 1))
     end
+    pos = nl + 1
   end
+  local tail = pos == 1 and buf or buf:sub(pos)
+  -- While requests are outstanding the tail is the start of a response, however large,
+  -- and must be kept whole; with none, it is stray output and only worth a bounded amount.
+  if next(pending) == nil then
+    tail = _cap_tail(tail, MAX_STDOUT_BYTES)
+  end
+  stdout_buf = tail
 end
 
 local function _on_exit(code, _signal)
@@ -180,6 +270,8 @@ function M.ensure_running(cmd)
   end
 
   proc = handle
+  spawned_at = uv.now()
+  answered = false
 
   uv.read_start(stdout_pipe, function(read_err, data)
     if read_err then
@@ -198,7 +290,12 @@ function M.ensure_running(cmd)
   return true
 end
 
-function M.send(request, callback)
+---@param request table
+---@param callback fun(resp: table|nil, err: string|nil)
+---@param timeout_ms? integer fail the request (and restart the worker) if no response arrives in time,
+--- counted from when all earlier requests have been answered; a worker that has not
+--- answered yet gets until its start-up grace period runs out
+function M.send(request, callback, timeout_ms)
   if not proc or not stdin_pipe or stdin_pipe:is_closing() then
     vim.schedule(function()
       callback(nil, "subprocess not running")
@@ -210,13 +307,18 @@ function M.send(request, callback)
   next_id = next_id + 1
   request.id = id
   pending[id] = callback
+  if timeout_ms and timeout_ms > 0 then
+    budgets[id] = timeout_ms
+    _start_oldest_deadline()
+  end
 
-  local line = vim.json.encode(request) .. "\n"
-  local ok = pcall(uv.write, stdin_pipe, line, function(write_err)
+  -- Hand libuv the payload and its newline as one vectored write, rather than copying
+  -- the whole encoded request again just to append "\n".
+  local chunks = { vim.json.encode(request), "\n" }
+  local ok = pcall(uv.write, stdin_pipe, chunks, function(write_err)
     if write_err then
-      local cb = pending[id]
+      local cb = _take_pending(id)
       if cb then
-        pending[id] = nil
         vim.schedule(function()
           cb(nil, "subprocess write error: " .. tostring(write_err))
         end)
@@ -224,9 +326,8 @@ function M.send(request, callback)
     end
   end)
   if not ok then
-    local cb = pending[id]
+    local cb = _take_pending(id)
     if cb then
-      pending[id] = nil
       vim.schedule(function()
         cb(nil, "subprocess write error: failed to write")
       end)
@@ -1,5 +1,9 @@
+import heapq
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import accumulate
+from operator import ne
 from typing import Any, Dict, List, Optional, Tuple
 
 import prosodic
@@ -9,6 +13,10 @@ import prosodic
 # - `[^\W\d_]` narrows that to letters (exclude non-word, digits, underscore).
 TOKEN_RE = re.compile(r"[^\W\d_]+(?:['’][^\W\d_]+)?")
 
+# Heuristic syllable counting for tokens the pronunciation layer cannot syllabify.
+NON_LETTER_RE = re.compile(r"[^a-z]")
+VOWEL_GROUP_RE = re.compile(r"[aeiouy]+")
+
 # Monosyllabic function words: default to unstressed in metrical context.
 # Based on Groves' rules (used by ZeuScansion) and the Scandroid's dictionary.
 UNSTRESSED_MONOSYLLABLES = frozenset({
@@ -59,6 +67,8 @@ STRESSED_MONOSYLLABLES = frozenset({
     "art",   # 64% S (archaic 2nd-person "thou art")
 })
 
+STRESS_SYMBOLS = frozenset("US")
+
 FOOT_TEMPLATES = {
     "iambic": "US",
     "trochaic": "SU",
@@ -94,6 +104,44 @@ LINE_NAME_BY_FEET = {
     5: "pentameter",
     6: "hexameter",
 }
+FEET_BY_LINE_NAME = {line_name: feet for feet, line_name in LINE_NAME_BY_FEET.items()}
+
+
+def _allowed_syllable_counts_for_meter(foot_name: str, feet: int) -> Tuple[int, ...]:
+    base_len = len(FOOT_TEMPLATES[foot_name]) * int(feet)
+    deltas = METER_LENGTH_DELTAS.get(foot_name, (0,))
+    allowed = sorted({base_len + delta for delta in deltas if (base_len + delta) > 0})
+    return tuple(allowed)
+
+
+def _build_candidate_meters_by_syllables() -> Dict[int, Tuple[Tuple[str, int], ...]]:
+    by_count: Dict[int, List[Tuple[str, int]]] = {}
+    for foot_name in FOOT_TEMPLATES:
+        for feet in LINE_NAME_BY_FEET:
+            for length in _allowed_syllable_counts_for_meter(foot_name, feet):
+                by_count.setdefault(length, []).append((foot_name, feet))
+    return {count: tuple(meters) for count, meters in by_count.items()}
+
+
+# (foot, feet) pairs whose allowed lengths include a given syllable count, in
+# FOOT_TEMPLATES then feet order; the candidate set only depends on the count.
+CANDIDATE_METERS_BY_SYLLABLES = _build_candidate_meters_by_syllables()
+
+# Expected stress templates for every known meter, plus the initial-inversion
+# variant of each iambic line, built once instead of per candidate per line.
+METER_TEMPLATES = {
+    (foot_name, feet): template_unit * feet
+    for foot_name, template_unit in FOOT_TEMPLATES.items()
+    for feet in LINE_NAME_BY_FEET
+}
+IAMBIC_INVERSION_TEMPLATES = {feet: "SU" + ("US" * (feet - 1)) for feet in LINE_NAME_BY_FEET}
+# Display names ("iambic pentameter") for the same meters, so ranking candidates
+# doesn't format a fresh name string per candidate per line.
+METER_NAMES = {
+    (foot_name, feet): f"{foot_name} {line_name}"
+    for foot_name in FOOT_TEMPLATES
+    for feet, line_name in LINE_NAME_BY_FEET.items()
+}
 
 # Pattern scoring constants for deterministic API compatibility.
 BINARY_FIRST_POS_DISCOUNT = 0.5
@@ -216,6 +264,76 @@ class _VerseVariantOp:
     arg: int = 0
 
 
+def _round_div(num: int, den: int) -> int:
+    """Integer equivalent of round(num / den) (half-to-even), for den > 0."""
+    q, r = divmod(num, den)
+    if 2 * r > den or (2 * r == den and q % 2 == 1):
+        q += 1
+    return q
+
+
+@lru_cache(maxsize=256)
+def _even_cuts(length: int, parts: int) -> Tuple[int, ...]:
+    """Cut points splitting `length` chars into `parts` near-equal pieces, longer first."""
+    base, rem = divmod(length, parts)
+    return tuple(i * base + min(i, rem) for i in range(parts + 1))
+
+
+@lru_cache(maxsize=64)
+def _parse_meter_name(meter_name: str) -> Optional[Tuple[str, int]]:
+    # Meter names come from a small fixed vocabulary, so parses are memoized.
+    m = METER_NAME_RE.match(meter_name.strip().lower())
+    if not m:
+        return None
+    feet = FEET_BY_LINE_NAME.get(m.group(2))
+    if feet is None:
+        return None
+    return m.group(1), feet
+
+
+@lru_cache(maxsize=4096)
+def _relative_syllable_spans(
+    token_lower: str,
+    token_len: int,
+    syllable_texts: Tuple[str, ...],
+) -> Tuple[Tuple[int, int], ...]:
+    """Syllable spans as offsets into the token, memoized since common words recur constantly."""
+    local_cursor = 0
+    out: List[Tuple[int, int]] = []
+    exact = True
+
+    for raw_text in syllable_texts:
+        s = (raw_text or "").lower()
+        if not s:
+            exact = False
+            out.append((local_cursor, local_cursor))
+            continue
+        idx = token_lower.find(s, local_cursor)
+        if idx == -1:
+            exact = False
+            out.append((local_cursor, local_cursor))
+            continue
+        out.append((idx, idx + len(s)))
+        local_cursor = idx + len(s)
+
+    if exact:
+        return tuple(out)
+
+    span_len = max(1, token_len)
+    widths = [max(1, len((text or "").strip())) for text in syllable_texts]
+    total_width = max(1, sum(widths))
+    cuts = [_round_div(accum * span_len, total_width) for accum in accumulate(widths, initial=0)]
+    rebuilt: List[Tuple[int, int]] = []
+    last = len(widths) - 1
+    for idx in range(len(widths)):
+        start = cuts[idx]
+        end = token_len if idx == last else cuts[idx + 1]
+        if end <= start:
+            end = min(token_len, start + 1)
+        rebuilt.append((start, end))
+    return tuple(rebuilt)
+
+
 class MeterEngine:
     def __init__(self) -> None:
         pass
@@ -224,13 +342,13 @@ class MeterEngine:
         return TOKEN_RE.findall(line)
 
     def _estimate_syllables_fallback(self, word: str) -> int:
-        w = re.sub(r"[^a-z]", "", (word or "").lower())
-        if not w:
-            return 1
+        w = (word or "").lower()
+        # Plain ASCII words (the common case) need no stripping pass.
+        if not (w.isascii() and w.isalpha()):
+            w = NON_LETTER_RE.sub("", w)
         if len(w) <= 3:
             return 1
-        vowel_groups = re.findall(r"[aeiouy]+", w)
-        count = len(vowel_groups)
+        count = len(VOWEL_GROUP_RE.findall(w))
         if w.endswith("e") and not w.endswith(("le", "ye")) and count > 1:
             count -= 1
         if w.endswith("le") and len(w) > 2 and w[-3] not in "aeiouy":
@@ -252,18 +370,8 @@ class MeterEngine:
             return []
         n = self._estimate_syllables_fallback(word_text or token_lower)
         n = max(1, min(n, len(token_lower)))
-        base = len(token_lower) // n
-        rem = len(token_lower) % n
-        parts: List[str] = []
-        cursor = 0
-        for i in range(n):
-            size = base + (1 if i < rem else 0)
-            if size <= 0:
-                break
-            parts.append(token_lower[cursor : cursor + size])
-            cursor += size
-        if not parts:
-            parts = [token_lower]
+        cuts = _even_cuts(len(token_lower), n)
+        parts = [token_lower[a:b] for a, b in zip(cuts, cuts[1:])]
         spans = self._align_syllables_in_token(line, token_start, token_end, parts)
         options = self._options_for_syllable(word_text, is_monosyllable=(len(parts) == 1), lexical_stressed=False)
         default_stress = min(options, key=lambda option: (option[1], option[0]))[0]
@@ -367,27 +475,16 @@ class MeterEngine:
     # -- Deterministic scoring helpers (API compatibility) --
 
     def _parse_meter_name(self, meter_name: str) -> Optional[Tuple[str, int]]:
-        m = METER_NAME_RE.match((meter_name or "").strip().lower())
-        if not m:
-            return None
-        foot_name, feet_name = m.group(1), m.group(2)
-        for n, label in LINE_NAME_BY_FEET.items():
-            if label == feet_name:
-                return foot_name, n
-        return None
+        return _parse_meter_name(meter_name or "")
 
     def _pattern_distance(self, a: str, b: str, foot_name: str) -> float:
         if not a and not b:
             return 0.0
-        common = min(len(a), len(b))
-        mismatch = 0.0
-        for idx in range(common):
-            if a[idx] == b[idx]:
-                continue
-            if idx == 0 and foot_name in {"iambic", "trochaic"}:
-                mismatch += BINARY_FIRST_POS_DISCOUNT
-            else:
-                mismatch += 1.0
+        # Count positional mismatches over the common prefix in C (map stops at the
+        # shorter string), then discount a first-position mismatch for binary feet.
+        mismatch = float(sum(map(ne, a, b)))
+        if mismatch and a[0] != b[0] and foot_name in {"iambic", "trochaic"}:
+            mismatch += BINARY_FIRST_POS_DISCOUNT - 1.0
         len_diff = abs(len(a) - len(b))
         if len_diff == 1 and len(a) > len(b) and a[-1] == "U":
             mismatch += FEMININE_ENDING_COST
@@ -396,13 +493,25 @@ class MeterEngine:
         return mismatch
 
     def _template_for_meter(self, foot_name: str, feet: int) -> str:
-        return FOOT_TEMPLATES[foot_name] * feet
+        template = METER_TEMPLATES.get((foot_name, feet))
+        if template is None:
+            template = FOOT_TEMPLATES[foot_name] * feet
+        return template
+
+    def _meter_name_for(self, foot_name: str, feet: int) -> str:
+        name = METER_NAMES.get((foot_name, feet))
+        if name is None:
+            name = f"{foot_name} {LINE_NAME_BY_FEET.get(feet, f'{feet}-foot')}"
+        return name
+
+    def _inversion_template(self, feet: int) -> str:
+        template = IAMBIC_INVERSION_TEMPLATES.get(feet)
+        if template is None:
+            template = "SU" + ("US" * (feet - 1))
+        return template
 
     def _allowed_syllable_counts_for_meter(self, foot_name: str, feet: int) -> Tuple[int, ...]:
-        base_len = len(FOOT_TEMPLATES[foot_name]) * int(feet)
-        deltas = METER_LENGTH_DELTAS.get(foot_name, (0,))
-        allowed = sorted({base_len + delta for delta in deltas if (base_len + delta) > 0})
-        return tuple(allowed)
+        return _allowed_syllable_counts_for_meter(foot_name, feet)
 
     def _foot_position_penalty(self, pattern: str, foot_name: str, template: str) -> float:
         if not pattern or foot_name not in {"iambic", "trochaic"}:
@@ -439,7 +548,7 @@ class MeterEngine:
         dist = self._pattern_distance(pattern, template, foot_name)
         dist += self._foot_position_penalty(pattern, foot_name, template)
         if foot_name == "iambic" and feet >= 2 and len(template) >= 2:
-            inversion = "SU" + ("US" * (feet - 1))
+            inversion = self._inversion_template(feet)
             inv_dist = self._pattern_distance(pattern, inversion, foot_name)
             inv_dist += self._foot_position_penalty(pattern, foot_name, inversion)
             inv_dist += IAMBIC_INITIAL_INVERSION_COST
@@ -469,31 +578,34 @@ class MeterEngine:
         if not pattern:
             return []
         candidates: List[Tuple[str, int, float]] = []
-        syllables = len(pattern)
-        for foot_name, template_unit in FOOT_TEMPLATES.items():
-            for feet in range(1, 6 + 1):
-                if syllables not in self._allowed_syllable_counts_for_meter(foot_name, feet):
-                    continue
-                template = template_unit * feet
-                dist = self._pattern_distance(pattern, template, foot_name)
-                normalizer = max(len(pattern), len(template), 1)
-                score = max(0.0, 1.0 - (dist / normalizer))
-                candidates.append((foot_name, feet, score))
+        for foot_name, feet in self._candidate_meters_for_syllables(len(pattern)):
+            template = self._template_for_meter(foot_name, feet)
+            dist = self._pattern_distance(pattern, template, foot_name)
+            normalizer = max(len(pattern), len(template), 1)
+            score = max(0.0, 1.0 - (dist / normalizer))
+            candidates.append((foot_name, feet, score))
         candidates.sort(key=lambda item: item[2], reverse=True)
         return candidates
 
+    def _normalize_stress_pattern(self, stress_pattern: str) -> str:
+        pattern = (stress_pattern or "").upper()
+        # Well-formed patterns are the common case: one C-level subset check, no per-char filtering.
+        if STRESS_SYMBOLS.issuperset(pattern):
+            return pattern
+        return "".join(filter(STRESS_SYMBOLS.__contains__, pattern))
+
     def score_stress_pattern_for_meter(self, stress_pattern: str, meter_name: str) -> Optional[float]:
         parsed = self._parse_meter_name(meter_name)
         if not parsed:
             return None
         foot_name, feet = parsed
-        pattern = "".join(ch for ch in (stress_pattern or "").upper() if ch in {"U", "S"})
+        pattern = self._normalize_stress_pattern(stress_pattern)
         if not pattern:
             return None
         return self._score_pattern_for_meter(pattern, foot_name, feet)
 
     def best_meter_for_stress_pattern(self, stress_pattern: str) -> Tuple[str, float, Dict[str, float]]:
-        pattern = "".join(ch for ch in (stress_pattern or "").upper() if ch in {"U", "S"})
+        pattern = self._normalize_stress_pattern(stress_pattern)
         if not pattern:
             return "", 0.0, {"margin": 0.0}
         candidates = self._meter_candidates(pattern)
@@ -533,8 +645,7 @@ class MeterEngine:
             if score > second_score:
                 second_score = score
         margin = max(0.0, best_score - second_score)
-        line_name = LINE_NAME_BY_FEET.get(best_feet, f"{best_feet}-foot")
-        meter_name_out = f"{best_name} {line_name}"
+        meter_name_out = self._meter_name_for(best_name, best_feet)
         debug: Dict[str, float] = {"margin": margin, "second_score": second_score, "iambic_bias": float(iambic_bias)}
         for i, (name, feet, score) in enumerate(rescored[:4], start=1):
             debug[f"top{i}_{name}_{feet}"] = score
@@ -590,14 +701,8 @@ class MeterEngine:
             base = BINARY_FIRST_POS_DISCOUNT
         return base + self._position_mismatch_extra(foot_name, template_idx)
 
-    def _candidate_meters_for_syllables(self, syllable_count: int) -> List[Tuple[str, int]]:
-        out: List[Tuple[str, int]] = []
-        for foot_name in FOOT_TEMPLATES.keys():
-            for feet in range(1, 6 + 1):
-                if syllable_count not in self._allowed_syllable_counts_for_meter(foot_name, feet):
-                    continue
-                out.append((foot_name, feet))
-        return out
+    def _candidate_meters_for_syllables(self, syllable_count: int) -> Tuple[Tuple[str, int], ...]:
+        return CANDIDATE_METERS_BY_SYLLABLES.get(syllable_count, ())
 
     def _viterbi_for_template(
         self,
@@ -621,6 +726,11 @@ class MeterEngine:
 
         allow_insert = len_diff < 0
         allow_delete = len_diff > 0
+        iambic_delete = allow_delete and foot_name == "iambic"
+        # Per-slot mismatch costs and per-syllable weak-stress costs don't depend on the
+        # DP cell, so compute them once instead of once per cell and option.
+        mismatch_costs = [self._mismatch_cost_at(foot_name, j) for j in range(m)]
+        weak_costs = [float(dict(unit.options).get("U", 0.0)) for unit in syllables] if iambic_delete else []
 
         for i in range(n + 1):
             for j in range(m + 1):
@@ -632,17 +742,15 @@ class MeterEngine:
                     unit = syllables[i]
                     expected = template[j]
                     for stress, opt_cost in unit.options:
-                        mismatch_cost = 0.0 if stress == expected else self._mismatch_cost_at(foot_name, j)
+                        mismatch_cost = 0.0 if stress == expected else mismatch_costs[j]
                         new_cost = cur + opt_cost + mismatch_cost
                         if new_cost < dp[i + 1][j + 1]:
                             dp[i + 1][j + 1] = new_cost
                             prev[i + 1][j + 1] = (i, j, "M", stress)
 
-                if allow_delete and foot_name == "iambic" and i < n and j == m:
-                    unit = syllables[i]
-                    option_costs = dict(unit.options)
+                if iambic_delete and i < n and j == m:
                     delete_stress = "U"
-                    delete_opt_cost = float(option_costs.get("U", 0.0))
+                    delete_opt_cost = weak_costs[i]
                     delete_penalty = LENGTH_MISMATCH_COST
                     if j == m and i == n - 1 and delete_stress == "U":
                         delete_penalty = FEMININE_ENDING_COST
@@ -651,24 +759,20 @@ class MeterEngine:
                         dp[i + 1][j] = new_cost
                         prev[i + 1][j] = (i, j, "D", delete_stress)
 
-                if allow_delete and foot_name == "iambic" and feet >= 4 and i < n and 0 < j < m and template[j] == "S":
+                if iambic_delete and feet >= 4 and i < n and 0 < j < m and template[j] == "S":
                     # Allow a single extra weak syllable before a strong slot
                     # (anapestic substitution) in iambic meters.
-                    unit = syllables[i]
-                    option_costs = dict(unit.options)
                     delete_stress = "U"
-                    delete_opt_cost = float(option_costs.get("U", 0.0))
+                    delete_opt_cost = weak_costs[i]
                     new_cost = cur + delete_opt_cost + IAMBIC_ANAPESTIC_SUB_COST
                     if new_cost < dp[i + 1][j]:
                         dp[i + 1][j] = new_cost
                         prev[i + 1][j] = (i, j, "D", delete_stress)
 
-                if allow_delete and foot_name == "iambic" and feet >= 5 and i < n and j == 0:
+                if iambic_delete and feet >= 5 and i < n and j == 0:
                     # Allow a single extra leading weak syllable (anacrusis/pickup).
-                    unit = syllables[i]
-                    option_costs = dict(unit.options)
                     delete_stress = "U"
-                    delete_opt_cost = float(option_costs.get("U", 0.0))
+                    delete_opt_cost = weak_costs[i]
                     new_cost = cur + delete_opt_cost + IAMBIC_ANACRUSIS_COST
                     if new_cost < dp[i + 1][j]:
                         dp[i + 1][j] = new_cost
@@ -713,7 +817,7 @@ class MeterEngine:
         best_pattern, best_cost = self._viterbi_for_template(syllables, foot_name, feet, template)
 
         if foot_name == "iambic" and feet >= 2 and len(template) >= 2:
-            inversion = "SU" + ("US" * (feet - 1))
+            inversion = self._inversion_template(feet)
             inv_pattern, inv_cost = self._viterbi_for_template(syllables, foot_name, feet, inversion)
             inv_cost += IAMBIC_INITIAL_INVERSION_COST
             if inv_cost < best_cost:
@@ -726,8 +830,26 @@ class MeterEngine:
         syllables: List[_SyllableUnit],
         context: Optional[Dict[str, Any]] = None,
     ) -> Tuple[str, float, Dict[str, float], str]:
+        meter_name, score, debug, pattern, top_paths = self._rank_meter_paths(syllables, context=context)
+        self._add_top_path_debug(debug, top_paths)
+        return meter_name, score, debug, pattern
+
+    @staticmethod
+    def _add_top_path_debug(debug: Dict[str, float], top_paths: List[_MeterPath]) -> None:
+        for idx, candidate in enumerate(top_paths, start=1):
+            debug[f"top{idx}_{candidate.foot_name}_{candidate.feet}"] = candidate.adjusted_score
+            debug[f"top{idx}_{candidate.foot_name}_{candidate.feet}_base"] = candidate.base_score
+
+    def _rank_meter_paths(
+        self,
+        syllables: List[_SyllableUnit],
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[str, float, Dict[str, float], str, List[_MeterPath]]:
+        # Like _best_meter_for_ambiguous_syllables, but hands back the leading paths
+        # instead of formatting their debug keys, so callers trying many variants
+        # only pay for the keys of the one they keep.
         if not syllables:
-            return "", 0.0, {"margin": 0.0}, ""
+            return "", 0.0, {"margin": 0.0}, "", []
 
         context_meter, context_strength = self._coerce_context(context)
         context_bonus_max = CONTEXT_PRIOR_MAX_BONUS * context_strength
@@ -745,8 +867,7 @@ class MeterEngine:
             viterbi_score = self._apply_meter_length_priors(viterbi_score, foot_name, feet, len(pattern))
             lexical_score = self._score_pattern_for_meter(lexical_pattern, foot_name, feet)
             base_score = (0.50 * viterbi_score) + (0.50 * lexical_score)
-            line_name = LINE_NAME_BY_FEET.get(feet, f"{feet}-foot")
-            meter_name = f"{foot_name} {line_name}"
+            meter_name = self._meter_name_for(foot_name, feet)
             context_bonus = context_bonus_max if meter_name == context_meter else 0.0
             adjusted_score = max(0.0, min(1.0, base_score + context_bonus))
             meter_paths.append(_MeterPath(
@@ -761,10 +882,12 @@ class MeterEngine:
 
         if not meter_paths:
             fallback = "".join(unit.default_stress for unit in syllables)
-            return "", 0.0, {"margin": 0.0}, fallback
+            return "", 0.0, {"margin": 0.0}, fallback, []
 
-        meter_paths.sort(key=lambda item: item.adjusted_score, reverse=True)
-        best = meter_paths[0]
+        # Only the leaders are needed (best + debug top-4); the bias and runner-up scans
+        # below don't depend on order.
+        top_paths = heapq.nlargest(4, meter_paths, key=lambda item: item.adjusted_score)
+        best = top_paths[0]
 
         iambic_bias = False
         iambic_bias_target = None
@@ -794,8 +917,7 @@ class MeterEngine:
                 second_score = candidate.adjusted_score
 
         margin = max(0.0, best.adjusted_score - second_score)
-        line_name = LINE_NAME_BY_FEET.get(best.feet, f"{best.feet}-foot")
-        meter_name_out = f"{best.foot_name} {line_name}"
+        meter_name_out = self._meter_name_for(best.foot_name, best.feet)
         debug: Dict[str, float] = {
             "margin": margin,
             "second_score": second_score,
@@ -803,10 +925,7 @@ class MeterEngine:
             "context_strength": context_strength,
             "context_bonus": best.context_bonus,
         }
-        for idx, candidate in enumerate(meter_paths[:4], start=1):
-            debug[f"top{idx}_{candidate.foot_name}_{candidate.feet}"] = candidate.adjusted_score
-            debug[f"top{idx}_{candidate.foot_name}_{candidate.feet}_base"] = candidate.base_score
-        return meter_name_out, best.adjusted_score, debug, best.pattern
+        return meter_name_out, best.adjusted_score, debug, best.pattern, top_paths
 
     def _align_syllables_in_token(
         self,
@@ -815,51 +934,16 @@ class MeterEngine:
         token_end: int,
         syllable_texts: List[str],
     ) -> List[Tuple[int, int]]:
-        token = line[token_start:token_end]
-        token_lower = token.lower()
-        local_cursor = 0
-        out: List[Tuple[int, int]] = []
-        exact = True
-
-        for raw_text in syllable_texts:
-            s = (raw_text or "").lower()
-            if not s:
-                exact = False
-                out.append((token_start + local_cursor, token_start + local_cursor))
-                continue
-            idx = token_lower.find(s, local_cursor)
-            if idx == -1:
-                exact = False
-                out.append((token_start + local_cursor, token_start + local_cursor))
-                continue
-            start = token_start + idx
-            end = token_start + idx + len(s)
-            out.append((start, end))
-            local_cursor = idx + len(s)
-
-        if exact:
-            return out
-
-        token_len = max(1, token_end - token_start)
-        widths = [max(1, len((text or "").strip())) for text in syllable_texts]
-        total_width = max(1, sum(widths))
-        rebuilt: List[Tuple[int, int]] = []
-        accum = 0
-        for idx, width in enumerate(widths):
-            start = token_start + int(round((accum / float(total_width)) * token_len))
-            accum += width
-            end = token_start + int(round((accum / float(total_width)) * token_len))
-            if idx == len(widths) - 1:
-                end = token_end
-            if end <= start:
-                end = min(token_end, start + 1)
-            rebuilt.append((start, end))
-        return rebuilt
+        token_lower = line[token_start:token_end].lower()
+        relative = _relative_syllable_spans(token_lower, token_end - token_start, tuple(syllable_texts))
+        return [(token_start + start, token_start + end) for start, end in relative]
 
     def _token_allows_verse_compression(self, word_text: str, syllable_count: int) -> bool:
         if syllable_count < 2:
             return False
-        normalized = (word_text or "").strip().lower().replace("’", "'")
+        # word_text is _TokenSyllables.word_text: already stripped, lowercased and with
+        # curly apostrophes straightened by analyze_line.
+        normalized = word_text or ""
         key = normalized.replace("'", "")
         if key in VERSE_COMPRESS_WORDS:
             return True
@@ -876,7 +960,7 @@ class MeterEngine:
     def _token_allows_ed_expansion(self, word_text: str, syllable_count: int) -> bool:
         if syllable_count != 1:
             return False
-        key = (word_text or "").strip().lower().replace("’", "'").replace("'", "")
+        key = (word_text or "").replace("'", "")  # normalized as in _token_allows_verse_compression
         if len(key) < 4:
             return False
         if not key.endswith("ed"):
@@ -963,7 +1047,7 @@ class MeterEngine:
         for info in token_infos:
             base_units.extend(info.units)
 
-        meter_name, best_score, debug_scores, resolved_pattern = self._best_meter_for_ambiguous_syllables(
+        meter_name, best_score, debug_scores, resolved_pattern, top_paths = self._rank_meter_paths(
             base_units,
             context=context,
         )
@@ -998,6 +1082,7 @@ class MeterEngine:
 
         if not ops:
             debug_scores = dict(debug_scores)
+            self._add_top_path_debug(debug_scores, top_paths)
             debug_scores["verse_ops"] = 0.0
             return meter_name, best_score, debug_scores, resolved_pattern, chosen_units
 
@@ -1005,25 +1090,32 @@ class MeterEngine:
         ops.sort(key=lambda op: (op.token_pos, op.kind, op.arg))
         ops = ops[:10]
 
-        base_by_token = [info.units for info in token_infos]
+        # Offset of each token's first unit in base_units (plus the end sentinel).
+        unit_starts = list(accumulate((len(info.units) for info in token_infos), initial=0))
 
         def apply_ops(apply_list: Tuple[_VerseVariantOp, ...]) -> List[_SyllableUnit]:
-            by_token = list(base_by_token)
+            # Ops touch at most a couple of tokens: record just those and splice them
+            # into base_units rather than copying and re-flattening every token.
+            changed: Dict[int, List[_SyllableUnit]] = {}
             for op in apply_list:
                 if not (0 <= op.token_pos < len(token_infos)):
                     continue
                 info = token_infos[op.token_pos]
-                cur = by_token[op.token_pos]
+                cur = changed.get(op.token_pos, info.units)
                 if op.kind == "pron_form":
                     if 0 <= op.arg < len(info.alt_units):
-                        by_token[op.token_pos] = info.alt_units[op.arg]
+                        changed[op.token_pos] = info.alt_units[op.arg]
                 elif op.kind == "merge_last_two":
-                    by_token[op.token_pos] = self._merge_last_two_syllables(info.word_text, cur)
+                    changed[op.token_pos] = self._merge_last_two_syllables(info.word_text, cur)
                 elif op.kind == "split_ed":
-                    by_token[op.token_pos] = self._split_trailing_ed(line, info.word_text, info.token_start, info.token_end, cur)
+                    changed[op.token_pos] = self._split_trailing_ed(line, info.word_text, info.token_start, info.token_end, cur)
             flat: List[_SyllableUnit] = []
-            for units in by_token:
-                flat.extend(units)
+            prev_end = 0
+            for pos in sorted(changed):
+                flat.extend(base_units[prev_end : unit_starts[pos]])
+                flat.extend(changed[pos])
+                prev_end = unit_starts[pos + 1]
+            flat.extend(base_units[prev_end:])
             return flat
 
         candidates: List[Tuple[_VerseVariantOp, ...]] = [()]
@@ -1042,32 +1134,33 @@ class MeterEngine:
             units = apply_ops(op_list)
             if not units:
                 continue
-            m, score, dbg, pat = self._best_meter_for_ambiguous_syllables(units, context=context)
+            m, score, dbg, pat, top = self._rank_meter_paths(units, context=context)
             penalty = 0.0
             for op in op_list:
                 penalty += VERSE_PRON_VARIANT_OP_PENALTY if op.kind == "pron_form" else VERSE_VARIANT_OP_PENALTY
             adjusted = score - penalty
             if adjusted > best_adjusted + 1e-9:
-                meter_name, best_score, debug_scores, resolved_pattern = m, score, dbg, pat
+                meter_name, best_score, debug_scores, resolved_pattern, top_paths = m, score, dbg, pat, top
                 best_adjusted = adjusted
                 chosen_units = units
                 chosen_ops = op_list
             elif abs(adjusted - best_adjusted) <= 1e-9 and adjusted > 0:
                 # Tie-breakers: higher raw score, then fewer ops, then stable meter name.
                 if score > best_score + 1e-9:
-                    meter_name, best_score, debug_scores, resolved_pattern = m, score, dbg, pat
+                    meter_name, best_score, debug_scores, resolved_pattern, top_paths = m, score, dbg, pat, top
                     chosen_units = units
                     chosen_ops = op_list
                 elif abs(score - best_score) <= 1e-9 and len(op_list) < len(chosen_ops):
-                    meter_name, best_score, debug_scores, resolved_pattern = m, score, dbg, pat
+                    meter_name, best_score, debug_scores, resolved_pattern, top_paths = m, score, dbg, pat, top
                     chosen_units = units
                     chosen_ops = op_list
                 elif abs(score - best_score) <= 1e-9 and len(op_list) == len(chosen_ops) and (m or "") < (meter_name or ""):
-                    meter_name, best_score, debug_scores, resolved_pattern = m, score, dbg, pat
+                    meter_name, best_score, debug_scores, resolved_pattern, top_paths = m, score, dbg, pat, top
                     chosen_units = units
                     chosen_ops = op_list
 
         debug_scores = dict(debug_scores)
+        self._add_top_path_debug(debug_scores, top_paths)
         debug_scores["verse_ops"] = float(len(chosen_ops))
         return meter_name, best_score, debug_scores, resolved_pattern, chosen_units
 
@@ -1080,9 +1173,12 @@ class MeterEngine:
         if not line.strip():
             return None
 
-        token_matches = list(TOKEN_RE.finditer(line))
-        tokens = [m.group(0) for m in token_matches]
-        token_spans = [(m.start(), m.end()) for m in token_matches]
+        # One walk over the matches fills both lists; no intermediate match list.
+        tokens: List[str] = []
+        token_spans: List[Tuple[int, int]] = []
+        for m in TOKEN_RE.finditer(line):
+            tokens.append(m.group(0))
+            token_spans.append(m.span())
         if not tokens:
             return None
 
@@ -1099,6 +1195,7 @@ class MeterEngine:
         token_infos: List[_TokenSyllables] = []
         token_cursor = 0
         line_char_len = len(line)
+        line_lower: Optional[str] = None
 
         for wt in pline.wordtokens:
             wtype = wt.wordtype
@@ -1116,7 +1213,9 @@ class MeterEngine:
                 # Search forward from the last token's end to avoid matching an
                 # earlier occurrence of the same word (e.g. "love love love").
                 search_from = token_spans[token_cursor - 1][1] if token_cursor > 0 and token_cursor <= len(token_spans) else 0
-                found_pos = line.lower().find(raw_word_l, search_from)
+                if line_lower is None:
+                    line_lower = line.lower()
+                found_pos = line_lower.find(raw_word_l, search_from)
                 if found_pos == -1:
                     found_pos = max(0, search_from)
                 token_start = max(0, min(line_char_len, found_pos))
@@ -1160,8 +1259,7 @@ class MeterEngine:
             )
             if not token_units:
                 continue
-            for unit in token_units:
-                syllables.append(unit)
+            syllables.extend(token_units)
             token_patterns.append(token_pattern_default or "U")
 
             alt_units: List[List[_SyllableUnit]] = []
@@ -1242,15 +1340,17 @@ class MeterEngine:
 
         syllable_positions: List[Tuple[str, bool]] = []
         syllable_char_spans: List[Tuple[int, int]] = []
-        token_patterns_resolved: List[str] = ["" for _ in token_patterns]
-        for idx, unit in enumerate(syllables):
-            stressed = output_pattern[idx] == "S"
-            syllable_positions.append((unit.text, stressed))
+        # Collect each token's stress marks in a list and join once, rather than
+        # growing a new string per syllable.
+        token_marks: List[List[str]] = [[] for _ in token_patterns]
+        n_tokens = len(token_marks)
+        for unit, mark in zip(syllables, output_pattern):
+            syllable_positions.append((unit.text, mark == "S"))
             syllable_char_spans.append((unit.char_start, unit.char_end))
-            if 0 <= unit.token_index < len(token_patterns_resolved):
-                token_patterns_resolved[unit.token_index] += output_pattern[idx]
+            if 0 <= unit.token_index < n_tokens:
+                token_marks[unit.token_index].append(mark)
 
-        token_patterns_out = [pat or "U" for pat in token_patterns_resolved]
+        token_patterns_out = ["".join(marks) or "U" for marks in token_marks]
         stress_pattern = "".join(token_patterns_out)
 
         parsed = self._parse_meter_name(meter_name)
@@ -1,17 +1,53 @@
 #!/usr/bin/env python3
+import codecs
 import json
 import sys
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple
 
 from metermeter.meter_engine import MeterEngine
 
+ANALYSIS_CACHE_MAX_ENTRIES = 4096
+
+# One reusable compact encoder for responses: no whitespace after separators and
+# raw UTF-8, instead of json.dumps building an encoder for every response.
+RESPONSE_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def _restore_escaped_bytes(exc: UnicodeError) -> Tuple[Any, int]:
+    """Encode error handler for the worker's stdout (see __main__).
+
+    Invalid UTF-8 read from stdin arrives as surrogateescape code points; write those
+    back as the original bytes, so echoed text matches the buffer line byte for byte.
+    Any other lone surrogate (only possible via a JSON escape) is backslash-escaped.
+    """
+    if isinstance(exc, UnicodeEncodeError):
+        chunk = exc.object[exc.start:exc.end]
+        if all(0xDC80 <= ord(ch) <= 0xDCFF for ch in chunk):
+            return bytes(ord(ch) - 0xDC00 for ch in chunk), exc.end
+        return codecs.backslashreplace_errors(exc)
+    raise exc
+
+
+codecs.register_error("metermeter.restore_escaped_bytes", _restore_escaped_bytes)
+
+
+def _utf8_len(text: str) -> int:
+    # Invalid input bytes arrive as surrogateescape code points (see __main__) and
+    # count as the single byte they stand for; other lone surrogates can't come from
+    # a buffer, so any width will do as long as encoding doesn't raise.
+    try:
+        return len(text.encode("utf-8", "surrogateescape"))
+    except UnicodeEncodeError:
+        return len(text.encode("utf-8", "surrogatepass"))
+
 
 def _char_to_byte_index(text: str, char_idx: int) -> int:
     if char_idx <= 0:
         return 0
     if char_idx >= len(text):
-        return len(text.encode("utf-8"))
-    return len(text[:char_idx].encode("utf-8"))
+        return _utf8_len(text)
+    return _utf8_len(text[:char_idx])
 
 
 def _stress_spans_from_syllables(
@@ -21,7 +57,12 @@ def _stress_spans_from_syllables(
 ) -> List[List[int]]:
     """Compute byte-level stress spans from char spans, with substring fallback."""
     spans: List[List[int]] = []
+    # Lines with no strong syllables need neither the span walk nor any byte conversion.
+    if not any(is_strong for _, is_strong in syllable_positions):
+        return spans
     text_len = len(text)
+    # For pure-ASCII lines (the common case) char offsets already are byte offsets.
+    ascii_only = text.isascii()
     if (
         isinstance(syllable_char_spans, list)
         and len(syllable_char_spans) == len(syllable_positions)
@@ -33,6 +74,9 @@ def _stress_spans_from_syllables(
             e = max(0, min(text_len, int(span_end)))
             if e <= s:
                 continue
+            if ascii_only:
+                spans.append([s, e])
+                continue
             b_s = _char_to_byte_index(text, s)
             b_e = _char_to_byte_index(text, e)
             if b_e > b_s:
@@ -52,6 +96,9 @@ def _stress_spans_from_syllables(
         syl_end = idx + len(syl_lower)
         cursor = syl_end
         if is_strong:
+            if ascii_only:
+                spans.append([idx, syl_end])
+                continue
             b_s = _char_to_byte_index(text, idx)
             b_e = _char_to_byte_index(text, syl_end)
             if b_e > b_s:
@@ -60,17 +107,14 @@ def _stress_spans_from_syllables(
 
 
 def _analyze_line(engine: MeterEngine, item: dict, context: Optional[Dict[str, Any]] = None) -> dict | None:
-    lnum = item.get("lnum")
-    text = item.get("text")
-    if not isinstance(lnum, int) or not isinstance(text, str):
-        return None
-    a = engine.analyze_line(text, line_no=lnum, context=context)
+    """Analyze one request item; callers have already checked its lnum/text types."""
+    a = engine.analyze_line(item["text"], line_no=item["lnum"], context=context)
     if a is None:
         return None
     spans = _stress_spans_from_syllables(
         a.source_text,
         a.syllable_positions,
-        getattr(a, "syllable_char_spans", None),
+        a.syllable_char_spans,
     )
     return {
         "lnum": int(a.line_no),
@@ -82,9 +126,48 @@ def _analyze_line(engine: MeterEngine, item: dict, context: Optional[Dict[str, A
     }
 
 
-def run_persistent() -> int:
+class _AnalysisCache:
+    """Bounded LRU of line results keyed by (text, context), shared across requests."""
+
+    def __init__(self, max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Any, ...], Optional[dict]]" = OrderedDict()
+
+    @staticmethod
+    def key_for(text: str, context: Optional[Dict[str, Any]]) -> Optional[Tuple[Any, ...]]:
+        if context is None:
+            return (text, "", 0.0)
+        meter = context.get("dominant_meter")
+        strength = context.get("dominant_strength")
+        if not isinstance(meter, (str, type(None))) or not isinstance(strength, (int, float, type(None))):
+            return None
+        return (text, meter or "", strength or 0.0)
+
+    def analyze(self, engine: MeterEngine, item: dict, context: Optional[Dict[str, Any]] = None) -> dict | None:
+        key = self.key_for(item["text"], context)
+        if key is None:
+            return _analyze_line(engine, item, context=context)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            cached = self._entries[key]
+        else:
+            cached = _analyze_line(engine, item, context=context)
+            self._entries[key] = cached
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if cached is None:
+            return None
+        # Results only differ by line number; never hand out the cached dict itself.
+        return {**cached, "lnum": item["lnum"]}
+
+
+def run_persistent(warm_up: bool = False) -> int:
     """Persistent mode: read newline-delimited JSON requests, respond on stdout."""
     engine = MeterEngine()
+    cache = _AnalysisCache()
+    if warm_up:
+        # Pay prosodic's lazy dictionary load before the first request arrives.
+        engine.analyze_line("Shall I compare thee to a summer's day")
 
     for raw in sys.stdin:
         raw = raw.strip()
@@ -109,15 +192,19 @@ def run_persistent() -> int:
             and isinstance(item.get("text"), str)
         ]
 
-        results = [r for item in items for r in [_analyze_line(engine, item, context=context)] if r is not None]
+        results = [r for item in items for r in [cache.analyze(engine, item, context=context)] if r is not None]
 
         payload = {
             "id": req_id,
             "results": results,
             "eval": {"line_count": len(items), "result_count": len(results)},
         }
-        sys.stdout.write(json.dumps(payload, ensure_ascii=True) + "\n")
-        sys.stdout.flush()
+        # Write the newline separately rather than concatenating, which would copy
+        # the whole encoded payload once more per response.
+        out = sys.stdout
+        out.write(RESPONSE_ENCODER.encode(payload))
+        out.write("\n")
+        out.flush()
 
     return 0
 
@@ -145,13 +232,20 @@ def main() -> int:
         "results": results,
         "eval": {"line_count": len(items), "result_count": len(results)},
     }
-    sys.stdout.write(json.dumps(payload, ensure_ascii=True))
+    sys.stdout.write(RESPONSE_ENCODER.encode(payload))
     return 0
 
 
 if __name__ == "__main__":
+    # Responses are emitted as raw UTF-8 (no \uXXXX escaping), so pin the pipe
+    # encoding rather than depending on the caller's locale. Buffers can hold invalid
+    # UTF-8 and JSON can carry lone surrogates; neither may kill the persistent worker.
+    # Bad input bytes pass through as surrogateescape code points and are written back
+    # unchanged, so results still match their buffer line's text.
+    sys.stdin.reconfigure(encoding="utf-8", errors="surrogateescape")
+    sys.stdout.reconfigure(encoding="utf-8", errors="metermeter.restore_escaped_bytes")
     mode = sys.argv[1] if len(sys.argv) > 1 else "persistent"
     if mode == "oneshot":
         raise SystemExit(main())
     else:
-        raise SystemExit(run_persistent())
+        raise SystemExit(run_persistent(warm_up=True))
@@ -30,6 +30,27 @@ local function extmarks(bufnr)
   return vim.api.nvim_buf_get_extmarks(bufnr, ns, 0, -1, { details = true })
 end
 
+-- row -> { ids = extmark ids on that row (ascending), hints = count of hint marks }
+local function marks_by_row(bufnr)
+  local out = {}
+  for _, m in ipairs(extmarks(bufnr)) do
+    local row = out[m[2]] or { ids = {}, hints = 0 }
+    out[m[2]] = row
+    row.ids[#row.ids + 1] = m[1]
+    if (m[4] or {}).virt_text then
+      row.hints = row.hints + 1
+    end
+  end
+  for _, row in pairs(out) do
+    table.sort(row.ids)
+  end
+  return out
+end
+
+local function same_ids(a, b)
+  return a ~= nil and b ~= nil and table.concat(a.ids, ",") == table.concat(b.ids, ",")
+end
+
 local function loading_marks(bufnr)
   local ns = vim.api.nvim_get_namespaces()["metermeter_loading"]
   if not ns then
@@ -438,7 +459,181 @@ local function run_loading_indicator_duplicate_background()
   vim.wait(100)
 end
 
+local function run_loading_indicator_letterless_duplicates()
+  -- Regression: repeated lines are sent once per request, and the worker returns no result
+  -- (so nothing is cached) for letterless lines; the unsent copies must still leave pending.
+  metermeter.setup({
+    rescan_interval_ms = 0,
+    debounce_ms = 1,
+    require_trailing_backslash = false,
+    ui = {
+      stress = true,
+      meter_hints = true,
+      loading_indicator = true,
+    },
+  })
+
+  vim.cmd("enew")
+  local bufnr = vim.api.nvim_get_current_buf()
+  vim.api.nvim_buf_set_name(bufnr, "/tmp/metermeter_smoke_loading_dividers.poem")
+  vim.bo[bufnr].filetype = "metermeter"
+  vim.api.nvim_buf_set_lines(bufnr, 0, -1, false, {
+    "The trampled fruit yields wine that's sweet and red.",
+    "* * *",
+    "And plants will dream, thy flax to fit a nuptial bed.",
+    "* * *",
+  })
+
+  metermeter.enable(bufnr)
+
+  local ok = wait_for(function()
+    local s = metermeter._debug_stats(bufnr)
+    return s.cli_count > 0 and (not s.scan_running) and (#extmarks(bufnr) > 0)
+  end, 8000)
+  if not ok then
+    fail("loading dividers: expected a settled scan with results")
+  end
+
+  vim.wait(150)
+  if #loading_marks(bufnr) ~= 0 then
+    fail("loading dividers: loading marks should be cleared for repeated letterless lines")
+  end
+
+  metermeter.disable(bufnr)
+  vim.wait(100)
+end
+
+local function run_incremental_extmarks()
+  -- Editing one line should only replace that line's marks; the other lines keep
+  -- their extmarks (same ids), and a line that stops being a scan line loses its marks.
+  metermeter.setup({
+    rescan_interval_ms = 0,
+    debounce_ms = 1,
+    require_trailing_backslash = false,
+  })
+
+  vim.cmd("enew")
+  local bufnr = vim.api.nvim_get_current_buf()
+  vim.api.nvim_buf_set_name(bufnr, "/tmp/metermeter_smoke_incremental.poem")
+  vim.bo[bufnr].filetype = "metermeter"
+  -- The first line stays the widest, so the hint column doesn't move with the edits.
+  vim.api.nvim_buf_set_lines(bufnr, 0, -1, false, {
+    "And plants will dream, thy flax to fit a nuptial bed.",
+    "The trampled fruit yields wine that's sweet and red.",
+    "Shall I compare thee to a summer's day?",
+  })
+
+  metermeter.enable(bufnr)
+  local ok = wait_for(function()
+    local rows = marks_by_row(bufnr)
+    return rows[0] and rows[1] and rows[2] and rows[0].hints == 1 and rows[1].hints == 1 and rows[2].hints == 1
+      and not metermeter._debug_stats(bufnr).scan_running
+  end, 8000)
+  if not ok then
+    fail("incremental extmarks: expected hints on all three lines")
+  end
+  local before = marks_by_row(bufnr)
+
+  vim.api.nvim_buf_set_lines(bufnr, 1, 2, false, { "Rough winds do shake the darling buds of May," })
+  ok = wait_for(function()
+    local row = marks_by_row(bufnr)[1]
+    return row ~= nil and row.hints == 1 and not vim.tbl_contains(before[1].ids, row.ids[1])
+      and not metermeter._debug_stats(bufnr).scan_running
+  end, 8000)
+  if not ok then
+    fail("incremental extmarks: edited line was not re-annotated")
+  end
+  local after = marks_by_row(bufnr)
+  if not same_ids(before[0], after[0]) or not same_ids(before[2], after[2]) then
+    fail("incremental extmarks: unedited lines had their extmarks replaced")
+  end
+  for _, id in ipairs(after[1].ids) do
+    if vim.tbl_contains(before[1].ids, id) then
+      fail("incremental extmarks: stale mark left on the edited line")
+    end
+  end
+
+  vim.api.nvim_buf_set_lines(bufnr, 1, 2, false, { "" })
+  ok = wait_for(function()
+    return marks_by_row(bufnr)[1] == nil and not metermeter._debug_stats(bufnr).scan_running
+  end, 8000)
+  if not ok then
+    fail("incremental extmarks: marks remain on a line that is no longer scanned")
+  end
+  local cleared = marks_by_row(bufnr)
+  if not same_ids(after[0], cleared[0]) or not same_ids(after[2], cleared[2]) then
+    fail("incremental extmarks: clearing one line replaced other lines' extmarks")
+  end
+
+  metermeter.disable(bufnr)
+  vim.wait(100)
+end
+
+local function run_scanner_window_ranges()
+  -- Multi-window candidate sets are built from merged row ranges; check them against a
+  -- plain per-row reference for overlapping, disjoint and buffer-edge-clipped windows.
+  local scanner = require("metermeter.scanner")
+
+  vim.cmd("enew")
+  local bufnr = vim.api.nvim_get_current_buf()
+  local lines = {}
+  for i = 1, 100 do
+    lines[i] = "line " .. i
+  end
+  vim.api.nvim_buf_set_lines(bufnr, 0, -1, false, lines)
+
+  local function reference(views, prefetch)
+    local max_row = #lines - 1
+    local visible, seen = {}, {}
+    for _, v in ipairs(views) do
+      for l = v.w0 - 1, v.w1 - 1 do
+        if not seen[l] then
+          seen[l] = true
+          visible[#visible + 1] = l
+        end
+      end
+    end
+    table.sort(visible)
+    local pre, pre_seen = {}, {}
+    for _, v in ipairs(views) do
+      local row = v.cursor_row - 1
+      for l = math.max(0, row - prefetch), math.min(max_row, row + prefetch) do
+        if not seen[l] and not pre_seen[l] then
+          pre_seen[l] = true
+          pre[#pre + 1] = l
+        end
+      end
+    end
+    table.sort(pre)
+    return visible, pre
+  end
+
+  local cases = {
+    -- Overlapping windows, one prefetch range clipped at the buffer start.
+    { prefetch = 10, views = { { w0 = 1, w1 = 20, cursor_row = 5 }, { w0 = 15, w1 = 40, cursor_row = 38 } } },
+    -- Disjoint windows with prefetch between them and clipped at the end.
+    { prefetch = 8, views = { { w0 = 10, w1 = 20, cursor_row = 12 }, { w0 = 80, w1 = 100, cursor_row = 99 } } },
+    -- Adjacent windows, given out of order, with prefetch entirely inside them.
+    { prefetch = 5, views = { { w0 = 51, w1 = 70, cursor_row = 52 }, { w0 = 30, w1 = 50, cursor_row = 45 } } },
+    -- A window nested inside another, and no prefetch.
+    { prefetch = 0, views = { { w0 = 10, w1 = 60, cursor_row = 30 }, { w0 = 20, w1 = 30, cursor_row = 25 } } },
+  }
+  for i, case in ipairs(cases) do
+    local visible, pre = scanner.candidate_line_set_for_buf(bufnr, case.prefetch, case.views)
+    local want_visible, want_pre = reference(case.views, case.prefetch)
+    if table.concat(visible, ",") ~= table.concat(want_visible, ",") then
+      fail("scanner ranges: case " .. i .. " visible lines differ: " .. table.concat(visible, ","))
+    end
+    if table.concat(pre, ",") ~= table.concat(want_pre, ",") then
+      fail("scanner ranges: case " .. i .. " prefetch lines differ: " .. table.concat(pre, ","))
+    end
+  end
+
+  vim.api.nvim_buf_delete(bufnr, { force = true })
+end
+
 local function main()
+  run_scanner_window_ranges()
   run_backslash_gate()
   run_comment_ignore()
   run_filetype_token_enable()
@@ -447,7 +642,9 @@ local function main()
   run_idle_no_extra_work()
   run_confidence_shading()
   run_loading_indicator_duplicate_background()
+  run_loading_indicator_letterless_duplicates()
   run_loading_indicator()
+  run_incremental_extmarks()
   vim.cmd("qa!")
 end
 
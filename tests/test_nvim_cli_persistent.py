@@ -1,6 +1,8 @@
 """Integration tests for the persistent subprocess protocol in metermeter_cli."""
 import io
 import json
+import os
+import subprocess
 import sys
 import unittest
 
@@ -100,3 +102,40 @@ class PersistentProtocolTests(unittest.TestCase):
         self.assertEqual(len(resps), 1)
         self.assertEqual(resps[0]["id"], 31)
         self.assertEqual(len(resps[0]["results"]), 2)
+
+    def test_repeated_text_reuses_analysis_with_own_lnum(self) -> None:
+        """Identical lines (e.g. refrains) share one analysis but keep their own lnum."""
+        text = self.LINES[0]["text"]
+        resps = _run_persistent([
+            {"id": 41, "lines": [{"lnum": 0, "text": text}, {"lnum": 8, "text": text}]},
+            {"id": 42, "lines": [{"lnum": 12, "text": text}]},
+        ])
+        first, second = resps[0]["results"]
+        third = resps[1]["results"][0]
+        self.assertEqual([first["lnum"], second["lnum"], third["lnum"]], [0, 8, 12])
+        for r in (second, third):
+            self.assertEqual(r["meter_name"], first["meter_name"])
+            self.assertEqual(r["stress_spans"], first["stress_spans"])
+
+    def test_invalid_utf8_does_not_kill_worker(self) -> None:
+        """Invalid UTF-8 and lone surrogates are answered with their text intact, and later requests still are."""
+        script = os.path.abspath(metermeter_cli.__file__)
+        bad_text = b"Shall I compare thee \xff to a summers day"
+        bad = b'{"id":51,"lines":[{"lnum":0,"text":"' + bad_text + b'"}]}\n'
+        surrogate = b'{"id":52,"lines":[{"lnum":1,"text":"Thou art more lovely \\ud800 and more temperate"}]}\n'
+        good = (json.dumps({"id": 53, "lines": self.LINES[:1]}) + "\n").encode("utf-8")
+        shutdown = b'{"shutdown":true}\n'
+        proc = subprocess.run(
+            [sys.executable, script],
+            input=bad + surrogate + good + shutdown,
+            capture_output=True,
+            timeout=300,
+        )
+        self.assertEqual(proc.returncode, 0, proc.stderr.decode("utf-8", "replace"))
+        out = proc.stdout.decode("utf-8", "surrogateescape")
+        resps = [json.loads(line) for line in out.splitlines() if line.strip()]
+        self.assertEqual([r["id"] for r in resps], [51, 52, 53])
+        # The echoed text is what results are cached under, so it must be the input's bytes.
+        self.assertEqual(resps[0]["results"][0]["text"].encode("utf-8", "surrogateescape"), bad_text)
+        self.assertEqual(resps[1]["results"][0]["text"], "Thou art more lovely \ud800 and more temperate")
+        self.assertEqual(len(resps[2]["results"]), 1)
@@ -32,6 +32,12 @@ class MeterRescoringTests(unittest.TestCase):
         self.assertGreaterEqual(score, 0.75)
         self.assertGreaterEqual(float(debug.get("margin") or 0.0), 0.03)
 
+    def test_stress_pattern_separators_and_case_are_ignored(self) -> None:
+        engine = MeterEngine()
+        clean = engine.best_meter_for_stress_pattern("USUSUSUSUS")
+        noisy = engine.best_meter_for_stress_pattern("us|us us/US-us us")
+        self.assertEqual(noisy, clean)
+
     def test_9_syllable_iambic_not_pentameter(self) -> None:
         engine = MeterEngine()
         meter, score, debug = engine.best_meter_for_stress_pattern("USUSUSUSU")
@@ -120,6 +120,12 @@ class NvimStressSpanTests(unittest.TestCase):
             self.assertLessEqual(e, encoded_len)
             self.assertGreater(e, s)
 
+    def test_no_strong_syllables_yields_no_spans(self) -> None:
+        text = "of the"
+        positions = [("of", False), ("the", False)]
+        self.assertEqual(metermeter_cli._stress_spans_from_syllables(text, positions), [])
+        self.assertEqual(metermeter_cli._stress_spans_from_syllables(text, positions, [(0, 2), (3, 6)]), [])
+
     def test_char_span_path_is_used_when_available(self) -> None:
         text = "the na\u00efve heart"
         spans = metermeter_cli._stress_spans_from_syllables(